@@ -62,6 +62,7 @@ def build_main_exe():
         # Hidden imports (force include)
         '--hidden-import=pymem',
         '--hidden-import=psutil',
+        '--hidden-import=numpy',
         '--hidden-import=tkinter',
         '--hidden-import=tkinter.ttk',
         '--hidden-import=tkinter.scrolledtext',
@@ -73,6 +74,21 @@ def build_main_exe():
         '--add-data=cindy_ui.py;.',
         '--add-data=cindy_config.py;.',
         '--add-data=cindy_splash.py;.',
+        '--add-data=cindy_scanner.py;.',
+        '--add-data=cindy_memory.py;.',
+        '--add-data=cindy_snapshot.py;.',
+        '--add-data=cindy_patterns.py;.',
+        '--add-data=cindy_pointers.py;.',
+        '--add-data=cindy_mobs.py;.',
+        '--add-data=cindy_scheduler.py;.',
+        '--add-data=cindy_events.py;.',
+        '--add-data=cindy_tracker.py;.',
+        '--add-data=cindy_spatial.py;.',
+        '--add-data=cindy_sessions.py;.',
+        '--add-data=cindy_stats.py;.',
+        '--add-data=cindy_replay.py;.',
+        '--add-data=cindy_addressdb.py;.',
+        '--add-data=cindy_processes.py;.',
         
         # Build settings
         '--clean',
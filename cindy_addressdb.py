@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Cindy Address DB - Known-good addresses per client build
+Every scan result is stored under the build it was found on (SHA-256 of
+endless.exe) and the range it was scanned in, together with its pointer chains,
+the field offsets, the pattern it matched and when it was last checked. On
+attach the entry for the running build is tried first: follow its chains (or
+take the stored address), check the pattern, done - no scan.
+
+Database (JSON, cindy_addresses.json):
+  {"version": 1,
+   "builds": {"<sha256>": {"exe": "endless.exe", "entries": {
+       "mob:0x0019A000-0x0019D000": {"kind": "mob", "address": "0x0019B4EC", "start": ..., "end": ...,
+                                     "chains": [...], "offsets": {...}, "pattern": "...",
+                                     "pattern_version": "3f2a9c1e", "found": ..., "validated": ...}}}}}
+
+  db = AddressDB()
+  db.store(build, 'mob', start, end, address, chains)
+  found = restore(source, db, build)     # {'mob': addr, 'player': addr} that still check out
+"""
+
+import os
+import json
+import time
+import hashlib
+
+import psutil
+
+import cindy_config
+import cindy_pointers
+import cindy_scanner
+import cindycore
+
+DB_VERSION = 1
+
+# Field offsets stored with each entry
+KIND_OFFSETS = {
+    'mob': cindycore.MOB_FIELD_OFFSETS,
+    'player': cindycore.PLAYER_FIELD_OFFSETS,
+}
+
+# Pattern text each kind has to match, and the address file it ends up in
+KIND_PATTERNS = {
+    'mob': (cindy_config.MOB_PATTERN, cindy_scanner.MOB_PATTERN),
+    'player': (cindy_config.PLAYER_PATTERN, cindy_scanner.PLAYER_PATTERN),
+}
+KIND_FILES = {
+    'mob': cindy_config.MOB_ADDRESS_FILE,
+    'player': cindy_config.PLAYER_ADDRESS_FILE,
+}
+
+# (path, size, mtime) -> sha256, so re-attaching doesn't hash the exe again
+_fingerprints = {}
+
+
+def file_fingerprint(path):
+    """SHA-256 of a file, cached until its size or mtime changes"""
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    if key not in _fingerprints:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        _fingerprints[key] = digest.hexdigest()
+    return _fingerprints[key]
+
+
+def build_fingerprint(pid):
+    """(sha256, exe name) of the client running as pid"""
+    exe = psutil.Process(pid).exe()
+    return file_fingerprint(exe), os.path.basename(exe)
+
+
+def pattern_version(pattern_text):
+    """Short hash of a pattern - entries found with an older pattern are ignored"""
+    return hashlib.sha1(' '.join(pattern_text.split()).encode('ascii')).hexdigest()[:8]
+
+
+def entry_key(kind, start, end):
+    return f"{kind}:0x{start:08X}-0x{end:08X}"
+
+
+class AddressDB:
+    """The address database file, read once and rewritten atomically on every change"""
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), cindy_config.ADDRESS_DB_FILE)
+        self.path = path
+        self.data = self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == DB_VERSION:
+                return data
+            print(f"Warning: {os.path.basename(self.path)} has an unknown version, starting a new one")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Warning: Could not read {os.path.basename(self.path)}: {e}")
+        return {'version': DB_VERSION, 'builds': {}}
+
+    def save(self):
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def store(self, build, kind, start, end, address, chains=(), exe_name=None):
+        """Remember a freshly scanned address for build (replaces the entry for the same range)"""
+        pattern_text = KIND_PATTERNS[kind][0]
+        now = time.time()
+        builds = self.data['builds']
+        record = builds.setdefault(build, {'exe': exe_name, 'entries': {}})
+        record['entries'][entry_key(kind, start, end)] = {
+            'kind': kind,
+            'address': f"0x{address:08X}",
+            'start': f"0x{start:08X}",
+            'end': f"0x{end:08X}",
+            'chains': [
+                {'module': chain.module, 'offset': f"0x{chain.offset:08X}",
+                 'offsets': [f"0x{offset:X}" for offset in chain.offsets]}
+                for chain in chains
+            ],
+            'offsets': dict(KIND_OFFSETS[kind]),
+            'pattern': pattern_text,
+            'pattern_version': pattern_version(pattern_text),
+            'found': now,
+            'validated': now,
+        }
+        self.save()
+
+    def entries(self, build, kind):
+        """Entries of kind for build that match the current pattern, last validated first"""
+        record = self.data['builds'].get(build)
+        if record is None:
+            return []
+        version = pattern_version(KIND_PATTERNS[kind][0])
+        entries = [entry for entry in record['entries'].values()
+                   if entry['kind'] == kind and entry.get('pattern_version') == version]
+        entries.sort(key=lambda entry: entry.get('validated', 0), reverse=True)
+        return entries
+
+    def mark_validated(self, entry, address):
+        """Entry checked out (at address) just now"""
+        entry['validated'] = time.time()
+        entry['address'] = f"0x{address:08X}"
+        self.save()
+
+
+def entry_chains(entry):
+    return [
+        cindy_pointers.PointerChain(chain['module'], int(chain['offset'], 16),
+                                    [int(offset, 16) for offset in chain['offsets']])
+        for chain in entry.get('chains', [])
+    ]
+
+
+def check_entry(source, entry):
+    """Live address of entry if its chains (or stored address) still point at a pattern match, else None"""
+    pattern = KIND_PATTERNS[entry['kind']][1]
+
+    def check(addr):
+        try:
+            return pattern.match_at(source.read_bytes(addr, pattern.length), 0)
+        except Exception:
+            return False
+
+    chains = entry_chains(entry)
+    if chains:
+        addr, _ = cindy_pointers.resolve_chains(source, chains, check)
+        if addr is not None:
+            return addr
+    addr = int(entry['address'], 16)
+    return addr if check(addr) else None
+
+
+def restore(source, db, build):
+    """{kind: address} for every kind with an entry for build that still checks out (entries are re-validated)"""
+    found = {}
+    for kind in KIND_PATTERNS:
+        for entry in db.entries(build, kind):
+            addr = check_entry(source, entry)
+            if addr is not None:
+                db.mark_validated(entry, addr)
+                found[kind] = addr
+                break
+    return found
@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+"""
+Cindy Bench - Scanner throughput on synthetic memory images
+Builds a fake address space (mob range + player range) full of skewed noise,
+plants a known number of mob and player structs plus near misses (one byte off),
+then runs every scan engine over it and checks the results against the plants
+and against the per-offset reference scanners (the original one-Python-call-per-
+offset scan, run once - it is slow) that the speedup column is measured against.
+
+Runs headless - no game, no Windows, no UI. The image is served either from
+memory (BufferMemorySource) or from a temporary snapshot file (needed for the
+parallel engine, whose workers open the file themselves).
+
+Usage:
+  python cindy_bench.py
+  python cindy_bench.py --size 256 --players 2000 --repeat 5
+  python cindy_bench.py --backend memory --engines mob-numpy,player-numpy
+  python cindy_bench.py --engines mob-numpy,player-numpy     # without the (slow) per-offset references
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from contextlib import contextmanager, nullcontext
+
+import cindy_config
+import cindy_memory
+import cindy_scanner
+import cindy_snapshot
+
+# Peak RSS comes from getrusage (Linux / macOS)
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+MB = 1024 * 1024
+
+# Planted structs sit on their own slot so they never overlap
+SLOT_SIZE = 64
+
+# Gap between player regions - exercises the region map
+REGION_GAP = 4096
+
+# Byte value -> noise byte. Mostly zeros, some FF and small ints, the rest anything -
+# close to what a game heap looks like byte by byte, and full of partial matches.
+NOISE_TABLE = bytes(
+    0x00 if i < 154 else
+    0xFF if i < 174 else
+    1 + i % 4 if i < 214 else
+    i
+    for i in range(256)
+)
+
+
+def noise(rng, size):
+    """size bytes of skewed noise"""
+    return bytearray(rng.randbytes(size).translate(NOISE_TABLE))
+
+
+def mob_struct(rng):
+    """A valid mob struct and its captured values"""
+    face, y, x, control = rng.randrange(4), rng.randrange(1, 256), rng.randrange(1, 256), rng.randrange(4)
+    data = bytes([face, 0, 0, 0, y, 0, 0, 0, x, 0, 0, 0, control, 0, 0, 0, control, 0, 0, 0]) + bytes(12)
+    return data, {'first_byte': face, 'fifth_byte': y, 'ninth_byte': x, 'control_bytes': control}
+
+
+def mob_near_miss(rng):
+    """A mob struct with exactly one rule broken"""
+    data = bytearray(mob_struct(rng)[0])
+    rule = rng.randrange(4)
+    if rule == 0:
+        data[0] = rng.randrange(4, 256)      # face out of range
+    elif rule == 1:
+        data[4] = 0                          # y must be non-zero
+    elif rule == 2:
+        data[16] = (data[12] + 1) % 4        # control copy differs
+    else:
+        data[rng.randrange(20, 32)] = 1      # dirt in the zero tail
+    return bytes(data)
+
+
+def player_struct(rng):
+    """A valid player struct and its captured values"""
+    x, y = rng.randrange(4, 181), rng.randrange(4, 181)
+    data = (bytes([x, 0, 0, 0, y, 0, 0, 0]) + rng.randbytes(2) + bytes(2) + rng.randbytes(2) + bytes(2)
+            + bytes(8) + rng.randbytes(6) + b'\xFF\xFF')
+    return data, {'first_byte': x, 'fifth_byte': y}
+
+
+def player_near_miss(rng):
+    """A player struct with exactly one rule broken"""
+    data = bytearray(player_struct(rng)[0])
+    rule = rng.randrange(4)
+    if rule == 0:
+        data[0] = rng.choice([0, 1, 2, 3, 181, 200, 255])   # x out of range
+    elif rule == 1:
+        data[10] = rng.randrange(1, 256)                     # half-zero dword isn't
+    elif rule == 2:
+        data[rng.randrange(16, 24)] = rng.randrange(1, 256)  # dirt in the zero run
+    else:
+        data[31] = 0xFE                                      # end marker off by one
+    return bytes(data)
+
+
+def plant(rng, regions, structs, near_misses):
+    """Write structs and near misses into random free slots of regions
+
+    structs is a list of (data, values); returns ({addr: values}, {near miss addrs}).
+    """
+    slots = [
+        (base, offset)
+        for base, data in regions
+        for offset in range(0, len(data) - SLOT_SIZE + 1, SLOT_SIZE)
+    ]
+    if len(slots) < len(structs) + len(near_misses):
+        raise ValueError("Image too small for that many planted structs")
+    chosen = rng.sample(slots, len(structs) + len(near_misses))
+    buffers = dict(regions)
+
+    planted = {}
+    for (base, offset), (data, values) in zip(chosen, structs):
+        buffers[base][offset:offset + len(data)] = data
+        planted[base + offset] = values
+
+    missed = set()
+    for (base, offset), data in zip(chosen[len(structs):], near_misses):
+        buffers[base][offset:offset + len(data)] = data
+        missed.add(base + offset)
+    return planted, missed
+
+
+def build_image(seed, player_size, player_regions, mob_count, player_count, near_miss_count):
+    """Synthetic address space, returns (regions, truth)
+
+    truth maps each pattern name to ([(base, size)] of its range, {addr: values} planted, {near miss addrs}).
+    """
+    rng = random.Random(seed)
+
+    mob_regions = [(cindy_config.MOB_MEMORY_START, noise(rng, cindy_config.MOB_MEMORY_END - cindy_config.MOB_MEMORY_START))]
+
+    region_size = player_size // player_regions
+    player_regions_list = []
+    base = cindy_config.PLAYER_MEMORY_START
+    for _ in range(player_regions):
+        player_regions_list.append((base, noise(rng, region_size)))
+        base += region_size + REGION_GAP
+
+    # Near misses are shared out in proportion to the real structs
+    mob_near_misses = near_miss_count * mob_count // max(1, mob_count + player_count)
+    mob_planted, mob_missed = plant(
+        rng, mob_regions,
+        [mob_struct(rng) for _ in range(mob_count)],
+        [mob_near_miss(rng) for _ in range(mob_near_misses)]
+    )
+    player_planted, player_missed = plant(
+        rng, player_regions_list,
+        [player_struct(rng) for _ in range(player_count)],
+        [player_near_miss(rng) for _ in range(near_miss_count - mob_near_misses)]
+    )
+
+    truth = {
+        'mob': ([(base, len(data)) for base, data in mob_regions], mob_planted, mob_missed),
+        'player': ([(base, len(data)) for base, data in player_regions_list], player_planted, player_missed),
+    }
+    return mob_regions + player_regions_list, truth
+
+
+@contextmanager
+def regex_engine(pattern):
+    """Run pattern through its regex fallback (what users without numpy get)"""
+    plan = pattern.plan
+    pattern.plan = None
+    try:
+        yield
+    finally:
+        pattern.plan = plan
+
+
+def check_matches(source, pattern, matches, planted, missed):
+    """(missing, near misses found, bogus) counts against the ground truth
+
+    Matches that weren't planted are fine as long as the bytes really match -
+    noise produces a few. Bogus counts wrong values and matches that don't hold up.
+    """
+    found = {addr: values for addr, _, values in matches}
+    missing = sum(1 for addr in planted if addr not in found)
+    near = sum(1 for addr in missed if addr in found)
+
+    bogus = 0
+    for addr, values in found.items():
+        if addr in planted:
+            bogus += values != planted[addr]
+        else:
+            bogus += not pattern.match_at(source.read_bytes(addr, pattern.length), 0)
+    return missing, near, bogus
+
+
+def peak_rss_mb():
+    """High-water resident size of this process plus its finished children, in MB (None if unknown)"""
+    if not RESOURCE_AVAILABLE:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return usage / (MB if sys.platform == 'darwin' else 1024)
+
+
+# ==================================================
+# REFERENCE MATCHERS - verbatim copies of the original BotUI if-chains
+# ==================================================
+
+def is_mob_pattern_match(buffer, offset):
+    """Check if bytes match mob pattern"""
+    try:
+        # Pattern: [00-03] 00 00 00 [01-FF] 00 00 00 [01-FF] 00 00 00 [00-03] 00 00 00 [00-03] 00 00 00 ...
+        if not (0 <= buffer[offset] <= 3):
+            return False
+        if buffer[offset+1] != 0 or buffer[offset+2] != 0 or buffer[offset+3] != 0:
+            return False
+        if not (1 <= buffer[offset+4] <= 255):
+            return False
+        if buffer[offset+5] != 0 or buffer[offset+6] != 0 or buffer[offset+7] != 0:
+            return False
+        if not (1 <= buffer[offset+8] <= 255):
+            return False
+        if buffer[offset+9] != 0 or buffer[offset+10] != 0 or buffer[offset+11] != 0:
+            return False
+        if not (0 <= buffer[offset+12] <= 3):
+            return False
+        if buffer[offset+13] != 0 or buffer[offset+14] != 0 or buffer[offset+15] != 0:
+            return False
+        if not (0 <= buffer[offset+16] <= 3) or buffer[offset+16] != buffer[offset+12]:
+            return False
+        if buffer[offset+17] != 0 or buffer[offset+18] != 0 or buffer[offset+19] != 0:
+            return False
+        for i in range(20, 32):
+            if buffer[offset+i] != 0:
+                return False
+        return True
+    except IndexError:
+        return False
+
+
+def extract_mob_dynamic_values(buffer, offset):
+    """Extract dynamic values from mob pattern"""
+    return {
+        'first_byte': buffer[offset],
+        'fifth_byte': buffer[offset+4],
+        'ninth_byte': buffer[offset+8],
+        'control_bytes': buffer[offset+12]
+    }
+
+
+def is_player_pattern_match(buffer, offset):
+    """Check if bytes match player pattern"""
+    try:
+        # Pattern: (4-180) 00 00 00 (4-180) 00 00 00 ?? ?? 00 00 ?? ?? 00 00 ... FF FF
+        if not (4 <= buffer[offset] <= 180):
+            return False
+        if buffer[offset+1] != 0 or buffer[offset+2] != 0 or buffer[offset+3] != 0:
+            return False
+        if not (4 <= buffer[offset+4] <= 180):
+            return False
+        if buffer[offset+5] != 0 or buffer[offset+6] != 0 or buffer[offset+7] != 0:
+            return False
+        if buffer[offset+10] != 0 or buffer[offset+11] != 0:
+            return False
+        if buffer[offset+14] != 0 or buffer[offset+15] != 0:
+            return False
+        for i in range(16, 24):
+            if buffer[offset+i] != 0:
+                return False
+        if buffer[offset+30] != 0xFF or buffer[offset+31] != 0xFF:
+            return False
+        return True
+    except IndexError:
+        return False
+
+
+def extract_player_static_values(buffer, offset):
+    """Extract static values from player pattern"""
+    return {
+        'first_byte': buffer[offset],
+        'fifth_byte': buffer[offset+4]
+    }
+
+
+def per_offset_scan(is_match, extract_values):
+    """The original scanner as a reference: one is_match() call per byte offset of every readable span
+
+    Same loop as the original scan_*_memory, except the last offset of each
+    buffer is checked too (the original stopped one short) so its matches can
+    be compared with the other engines.
+    """
+    def scan(source, start, end):
+        matches = []
+        for addr, buffer in cindy_scanner.read_ranges(source, start, end):
+            for offset in range(0, len(buffer) - 31):
+                if is_match(buffer, offset):
+                    matches.append((addr + offset, None, extract_values(buffer, offset)))
+        return matches
+    return scan
+
+
+def engine_list(workers):
+    """(name, pattern name, pattern, scan function, uses the regex fallback, needs a file backed source, is the reference)"""
+    def scan_mob(source, start, end):
+        return cindy_scanner.scan_mob_range(source, start, end, 1)
+
+    serial = cindy_scanner.ParallelScanner(1)
+    parallel = cindy_scanner.ParallelScanner(workers)
+
+    def scan_player(source, start, end):
+        return serial.scan(source, start, end, 'player')
+
+    def scan_player_parallel(source, start, end):
+        return parallel.scan(source, start, end, 'player')
+
+    # References first - every other engine of the same pattern is compared with them
+    engines = [
+        ('mob-reference', 'mob', cindy_scanner.MOB_PATTERN, per_offset_scan(is_mob_pattern_match, extract_mob_dynamic_values), True, False, True),
+        ('mob-numpy', 'mob', cindy_scanner.MOB_PATTERN, scan_mob, False, False, False),
+        ('mob-regex', 'mob', cindy_scanner.MOB_PATTERN, scan_mob, True, False, False),
+        ('player-reference', 'player', cindy_scanner.PLAYER_PATTERN, per_offset_scan(is_player_pattern_match, extract_player_static_values), True, False, True),
+        ('player-numpy', 'player', cindy_scanner.PLAYER_PATTERN, scan_player, False, False, False),
+        ('player-regex', 'player', cindy_scanner.PLAYER_PATTERN, scan_player, True, False, False),
+        ('player-parallel', 'player', cindy_scanner.PLAYER_PATTERN, scan_player_parallel, False, True, False),
+    ]
+    return engines, parallel
+
+
+def run_engine(source, scan, pattern, use_regex, start, end, repeat):
+    """Best time of repeat runs, and the matches of the last run"""
+    best = None
+    matches = []
+    for _ in range(repeat):
+        with regex_engine(pattern) if use_regex else nullcontext():
+            started = time.perf_counter()
+            matches = scan(source, start, end)
+            elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Cindy memory scanners on synthetic images")
+    parser.add_argument('--size', type=int, default=(cindy_config.PLAYER_MEMORY_END - cindy_config.PLAYER_MEMORY_START) // MB,
+                        help='player image size in MB (default: the configured player range)')
+    parser.add_argument('--regions', type=int, default=8, help='number of player regions (split by unreadable gaps)')
+    parser.add_argument('--mobs', type=int, default=20, help='mob structs planted in the mob range')
+    parser.add_argument('--players', type=int, default=200, help='player structs planted in the player range')
+    parser.add_argument('--near-misses', type=int, default=200, help='near-miss structs (split over both ranges)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per engine, best time is reported')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--backend', choices=['snapshot', 'memory'], default='snapshot')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='processes for player-parallel')
+    parser.add_argument('--engines', help='comma separated engine names (default: all available)')
+    args = parser.parse_args()
+
+    print(f"Building image: {args.size} MB player range in {args.regions} regions, "
+          f"{args.mobs} mobs, {args.players} players, {args.near_misses} near misses (seed {args.seed})")
+    regions, truth = build_image(args.seed, args.size * MB, args.regions, args.mobs, args.players, args.near_misses)
+
+    snapshot_path = None
+    if args.backend == 'snapshot':
+        handle, snapshot_path = tempfile.mkstemp(suffix=cindy_snapshot.SNAPSHOT_EXTENSION)
+        os.close(handle)
+        now = time.time()
+        cindy_snapshot.write_snapshot(snapshot_path, [(base, data, 0x04, now) for base, data in regions])
+        source = cindy_snapshot.SnapshotMemorySource(snapshot_path)
+    else:
+        source = cindy_memory.BufferMemorySource(regions)
+    del regions
+    cindy_memory.region_map(source, refresh=True)
+
+    engines, parallel = engine_list(args.workers)
+    wanted = set(args.engines.split(',')) if args.engines else None
+
+    print()
+    print(f"{'engine':<16} {'MB':>7} {'ms':>9} {'MB/s':>9} {'speedup':>8} {'matches/s':>11} "
+          f"{'found':>6} {'missing':>7} {'near':>5} {'bogus':>5} {'peak RSS MB':>11}  result")
+
+    # Pattern name -> (time, {addr: values}) of its reference run
+    references = {}
+
+    failed = False
+    try:
+        for name, pattern_name, pattern, scan, use_regex, needs_file, is_reference in engines:
+            if wanted is not None and name not in wanted:
+                continue
+            if not use_regex and not cindy_scanner.NUMPY_AVAILABLE:
+                print(f"{name:<16} skipped (numpy not installed)")
+                continue
+            if needs_file and args.backend != 'snapshot':
+                print(f"{name:<16} skipped (needs --backend snapshot)")
+                continue
+
+            spans, planted, missed = truth[pattern_name]
+            start = spans[0][0]
+            end = spans[-1][0] + spans[-1][1]
+            size = sum(span_size for _, span_size in spans) / MB
+
+            elapsed, matches = run_engine(source, scan, pattern, use_regex, start, end, 1 if is_reference else args.repeat)
+            missing, near, bogus = check_matches(source, pattern, matches, planted, missed)
+            ok = missing == 0 and near == 0 and bogus == 0
+
+            found = {addr: values for addr, _, values in matches}
+            speedup = ''
+            if is_reference:
+                references[pattern_name] = (elapsed, found)
+            elif pattern_name in references:
+                reference_time, reference_found = references[pattern_name]
+                speedup = f"{reference_time / elapsed:.1f}x"
+                # Same matches, same values as the original scanner
+                ok &= found == reference_found
+            failed |= not ok
+
+            rss = peak_rss_mb()
+            print(f"{name:<16} {size:>7.1f} {elapsed * 1000:>9.1f} {size / elapsed:>9.1f} {speedup:>8} {len(matches) / elapsed:>11.0f} "
+                  f"{len(matches):>6} {missing:>7} {near:>5} {bogus:>5} "
+                  f"{'n/a' if rss is None else f'{rss:.0f}':>11}  {'ok' if ok else 'FAIL'}")
+    finally:
+        parallel.shutdown()
+        source.close()
+        if snapshot_path:
+            os.remove(snapshot_path)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
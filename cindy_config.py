@@ -33,10 +33,46 @@ PLAYER_MEMORY_END = 0x07000000
 MOB_MEMORY_START = 0x0019A000
 MOB_MEMORY_END = 0x0019D000
 
+# Struct patterns (cindy_patterns syntax - see cindy_patterns.py)
+# Mob: face, y, x, control dword repeated, then zeros (may change per update)
+MOB_PATTERN = "[00-03] 00 00 00  [01-FF] 00 00 00  [01-FF] 00 00 00  [00-03] 00 00 00  =12 00 00 00  00*12"
+MOB_PATTERN_CAPTURES = {'first_byte': 0, 'fifth_byte': 4, 'ninth_byte': 8, 'control_bytes': 12}
+
+# Player: x, y, two half-zero dwords, zero run, then FF FF at +30
+PLAYER_PATTERN = "[04-B4] 00 00 00  [04-B4] 00 00 00  ?? ?? 00 00  ?? ?? 00 00  00*8  ??*6  FF FF"
+PLAYER_PATTERN_CAPTURES = {'first_byte': 0, 'fifth_byte': 4}
+
 # Scan settings
 DEFAULT_SCAN_DELAY = 1.0  # seconds
-MIN_SCANS_REQUIRED = 4
-MIN_DIFFERENT_VALUES = 4
+MIN_SCANS_REQUIRED = 4          # by this round any confident mob candidate ends the scan
+
+# Mob scan early stopping (see cindy_scanner.score_mob_candidate)
+MOB_CONFIDENCE_THRESHOLD = 0.85 # candidate counts as a mob from here on (one plausible step)
+MOB_DOUBT_CONFIDENCE = 0.6      # undecided candidates above this keep the scan going (until MIN_SCANS_REQUIRED)
+MOB_MAX_STEP = 4                # tiles a mob can plausibly walk between two rounds
+MOB_MOTION_FILTER = True        # drop candidates that jump or walk a tile they aren't facing
+
+# Pointer scan settings (static chains to found addresses, see cindy_pointers.py)
+POINTER_MAX_DEPTH = 4          # pointer hops from a module to the address
+POINTER_MAX_OFFSET = 0x800     # largest struct offset added after each hop
+POINTER_MAX_CHAINS = 8         # chains saved per address
+
+# Bot loop polling (see cindy_scheduler.py)
+POLL_MIN_INTERVAL = 0.002      # seconds between ticks while values are changing
+POLL_MAX_INTERVAL = 0.05       # seconds between ticks once everything is idle
+POLL_IDLE_BACKOFF = 1.25       # interval multiplier per unchanged tick
+ERROR_BACKOFF_BASE = 0.01      # first retry delay after a failed tick
+ERROR_BACKOFF_MAX = 2.0        # longest retry delay
+
+# Client process watching (see cindy_processes.py)
+CLIENT_PROCESS_NAME = "endless.exe"
+PROCESS_ALIVE_INTERVAL = 0.05  # seconds between liveness checks of known clients
+PROCESS_SCAN_INTERVAL = 1.0    # seconds between looks for newly started clients
+
+# Mob tracking (see cindy_tracker.py)
+MOB_HISTORY_LENGTH = 32        # recent positions kept per mob
+MAX_TRACKED_MOBS = 512         # mobs remembered (least recently seen ones are forgotten)
+SPATIAL_CELL_SIZE = 8          # tiles per grid cell for nearest-mob queries (see cindy_spatial.py)
 
 # ==================================================
 # UI CONFIGURATION
@@ -95,6 +131,8 @@ VERBOSE_LOGGING = False
 # Address files
 PLAYER_ADDRESS_FILE = "cindys_baby_daddy.txt"
 MOB_ADDRESS_FILE = "cindys_ex_bf.txt"
+ADDRESS_CHECK_INTERVAL = 0.5  # seconds between mtime checks of the address files while the bot runs
+ADDRESS_DB_FILE = "cindy_addresses.json"  # known-good addresses per client build (see cindy_addressdb.py)
 
 # Image file
 CINDY_IMAGE_FILE = "projectcindy.gla"
@@ -102,6 +140,13 @@ CINDY_IMAGE_FILE = "projectcindy.gla"
 # Backup directory
 BACKUP_DIR = "backup_before_rename"
 
+# Tick latency histograms, written when the bot stops
+TICK_STATS_FILE = "cindy_tick_stats.json"
+
+# Record every tick's reads for replay (see cindy_replay.py)
+RECORD_POLL_LOG = False
+POLL_LOG_FILE = "cindy_poll.log"
+
 # ==================================================
 # PACKET SNIFFER CONFIGURATION
 # ==================================================
@@ -120,7 +165,7 @@ TOOLS_AVAILABLE = {
     'packet_sniffer': True,
     'eolib_test': True,
     'memory_viewer': False,  # Coming soon
-    'address_manager': False,  # Coming soon
+    'address_manager': True,  # cindy_addressdb.py
     'pattern_scanner': False,  # Coming soon
     'performance_monitor': False,  # Coming soon
     'debug_console': False,  # Coming soon
@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+Cindy Memory - Pluggable memory sources
+Everything that reads game memory (scanners, bot loop) goes through a MemorySource,
+so the same code runs against a live client, /proc/<pid>/mem or a dump file.
+
+Backends:
+  PymemMemorySource     - live endless.exe on Windows (ReadProcessMemory)
+  ProcMemorySource      - live process on Linux (/proc/<pid>/mem, e.g. the client under Wine)
+  BufferMemorySource    - regions held in memory (synthetic images for benchmarks)
+  SnapshotMemorySource  - captured snapshot file, memory-mapped (see cindy_snapshot.py)
+"""
+
+import os
+import sys
+import bisect
+import struct
+import ctypes
+from collections import namedtuple
+
+# Try to import pymem for the Windows backend
+try:
+    import pymem
+    PYMEM_AVAILABLE = True
+except ImportError:
+    PYMEM_AVAILABLE = False
+
+# One readable span of the target's address space
+MemoryRegion = namedtuple('MemoryRegion', ['base', 'size', 'protection'])
+
+# One loaded image (exe / dll) - its memory sits at the same offset from base every run
+MemoryModule = namedtuple('MemoryModule', ['name', 'base', 'size'])
+
+INT_STRUCT = struct.Struct('<i')
+
+# Fields closer than this share one read in a ReadPlan
+PLAN_MERGE_GAP = 256
+
+
+class MemoryReadError(OSError):
+    """Raised when an address can't be read from a memory source"""
+    pass
+
+
+class MemorySource:
+    """Base class for memory backends - subclasses implement read_into and regions"""
+
+    def __init__(self, pid=None):
+        self.pid = pid
+
+    def read_into(self, addr, buffer):
+        """Fill buffer (any writable buffer) from addr, returns bytes read"""
+        raise NotImplementedError
+
+    def regions(self):
+        """List of readable MemoryRegion spans, sorted by base address"""
+        raise NotImplementedError
+
+    def modules(self):
+        """List of loaded MemoryModule images (raises NotImplementedError if the backend has none)"""
+        raise NotImplementedError
+
+    def read_bytes(self, addr, size):
+        """Read size bytes from addr, raises MemoryReadError if nothing could be read"""
+        buffer = bytearray(size)
+        count = self.read_into(addr, buffer)
+        if count < size:
+            del buffer[count:]
+        return bytes(buffer)
+
+    def read_int(self, addr):
+        """Read a signed 32-bit int (same as pymem's read_int)"""
+        return INT_STRUCT.unpack(self.read_bytes(addr, 4))[0]
+
+    def spec(self):
+        """Picklable (class, args) pair that opens an equivalent source in another process"""
+        return (type(self), (self.pid,))
+
+    def cache_key(self):
+        """Key for per-process caches such as region maps - the PID for live sources"""
+        return self.pid if self.pid is not None else self.spec()
+
+    def generation(self):
+        """Tells sources with the same spec apart over time - the process start time for live sources (None if unknown)"""
+        if self.pid is None:
+            return None
+        try:
+            import psutil
+            return psutil.Process(self.pid).create_time()
+        except Exception:
+            return None
+
+    def close(self):
+        """Release the backend's handle"""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class MEMORY_BASIC_INFORMATION(ctypes.Structure):
+    """VirtualQueryEx result (native pointer size)"""
+    _fields_ = [
+        ('BaseAddress', ctypes.c_void_p),
+        ('AllocationBase', ctypes.c_void_p),
+        ('AllocationProtect', ctypes.c_ulong),
+        ('RegionSize', ctypes.c_size_t),
+        ('State', ctypes.c_ulong),
+        ('Protect', ctypes.c_ulong),
+        ('Type', ctypes.c_ulong),
+    ]
+
+
+class PymemMemorySource(MemorySource):
+    """Live process on Windows through pymem's process handle"""
+
+    MEM_COMMIT = 0x1000
+    PAGE_NOACCESS = 0x01
+    PAGE_GUARD = 0x100
+
+    def __init__(self, pid):
+        if not PYMEM_AVAILABLE:
+            raise RuntimeError("pymem not installed. Install with: pip install pymem")
+        super().__init__(pid)
+        self.pm = pymem.Pymem(pid)
+        self.kernel32 = ctypes.windll.kernel32
+
+    def read_into(self, addr, buffer):
+        size = len(buffer)
+        target = (ctypes.c_char * size).from_buffer(buffer)
+        bytes_read = ctypes.c_size_t()
+
+        success = self.kernel32.ReadProcessMemory(
+            self.pm.process_handle,
+            ctypes.c_void_p(addr),
+            target,
+            size,
+            ctypes.byref(bytes_read)
+        )
+
+        # Partial copies still count as long as something came back
+        if not success and bytes_read.value == 0:
+            raise MemoryReadError(f"Could not read 0x{addr:08X} ({size} bytes)")
+        return bytes_read.value
+
+    def regions(self):
+        mbi = MEMORY_BASIC_INFORMATION()
+        regions = []
+        addr = 0
+
+        while self.kernel32.VirtualQueryEx(self.pm.process_handle, ctypes.c_void_p(addr), ctypes.byref(mbi), ctypes.sizeof(mbi)):
+            base = mbi.BaseAddress or 0
+            if (mbi.State == self.MEM_COMMIT
+                    and not mbi.Protect & self.PAGE_NOACCESS
+                    and not mbi.Protect & self.PAGE_GUARD):
+                regions.append(MemoryRegion(base, mbi.RegionSize, mbi.Protect))
+
+            next_addr = base + mbi.RegionSize
+            if next_addr <= addr:
+                break
+            addr = next_addr
+
+        return regions
+
+    def modules(self):
+        return [
+            MemoryModule(module.name, module.lpBaseOfDll, module.SizeOfImage)
+            for module in self.pm.list_modules()
+        ]
+
+    def close(self):
+        self.pm.close_process()
+
+
+class ProcMemorySource(MemorySource):
+    """Live process on Linux through /proc/<pid>/mem (needs ptrace rights on the target)"""
+
+    def __init__(self, pid):
+        super().__init__(pid)
+        self.fd = os.open(f"/proc/{pid}/mem", os.O_RDONLY)
+
+    def read_into(self, addr, buffer):
+        try:
+            count = os.preadv(self.fd, [buffer], addr)
+        except OSError as e:
+            raise MemoryReadError(f"Could not read 0x{addr:08X} ({len(buffer)} bytes): {e}")
+        if count == 0:
+            raise MemoryReadError(f"Could not read 0x{addr:08X} ({len(buffer)} bytes)")
+        return count
+
+    def regions(self):
+        regions = []
+        with open(f"/proc/{self.pid}/maps", 'r') as f:
+            for line in f:
+                fields = line.split()
+                start, end = (int(value, 16) for value in fields[0].split('-'))
+                perms = fields[1]
+                if perms[0] == 'r':
+                    regions.append(MemoryRegion(start, end - start, perms))
+        return regions
+
+    def modules(self):
+        # Every mapping of a file belongs to that image - take the lowest and highest address
+        spans = {}
+        with open(f"/proc/{self.pid}/maps", 'r') as f:
+            for line in f:
+                fields = line.split(maxsplit=5)
+                if len(fields) < 6 or not fields[5].startswith('/'):
+                    continue
+                start, end = (int(value, 16) for value in fields[0].split('-'))
+                name = os.path.basename(fields[5].strip())
+                low, high = spans.get(name, (start, end))
+                spans[name] = (min(low, start), max(high, end))
+        return sorted(
+            (MemoryModule(name, start, end - start) for name, (start, end) in spans.items()),
+            key=lambda module: module.base
+        )
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class BufferMemorySource(MemorySource):
+    """Address space made of in-memory (base, data) regions
+
+    spec() carries the data itself, so worker processes get a full copy -
+    use a snapshot file for parallel scans of large images.
+    """
+
+    def __init__(self, regions, modules=()):
+        super().__init__()
+        self.region_data = sorted((base, bytes(data)) for base, data in regions)
+        self.region_bases = [base for base, _ in self.region_data]
+        self.module_list = list(modules)
+        # Region map key - unique for the life of this source, unlike id()
+        self.token = object()
+
+    def read_into(self, addr, buffer):
+        target = memoryview(buffer).cast('B')
+        count = 0
+
+        # Keep copying while the next byte is covered by a region (back to back regions read as one)
+        while count < len(target):
+            i = bisect.bisect_right(self.region_bases, addr + count) - 1
+            if i < 0:
+                break
+            base, data = self.region_data[i]
+            start = addr + count - base
+            if start >= len(data):
+                break
+            size = min(len(target) - count, len(data) - start)
+            target[count:count + size] = data[start:start + size]
+            count += size
+
+        if count == 0:
+            raise MemoryReadError(f"0x{addr:08X} is outside the buffer regions")
+        return count
+
+    def regions(self):
+        return [MemoryRegion(base, len(data), 0x04) for base, data in self.region_data]
+
+    def modules(self):
+        return list(self.module_list)
+
+    def spec(self):
+        # Tuples - worker processes key their open sources on the spec
+        return (type(self), (tuple(self.region_data), tuple(self.module_list)))
+
+    def cache_key(self):
+        return (type(self), self.token)
+
+    def close(self):
+        forget_region_map(self.cache_key())
+
+
+class ReadPlan:
+    """Reads a fixed set of named int32 fields with as few read calls as possible
+
+    Fields within PLAN_MERGE_GAP bytes of each other are merged into one read.
+    Every read fills the same preallocated buffer and is decoded by one
+    precompiled struct (gaps become pad bytes), so a tick allocates nothing
+    but the result dict.
+    """
+
+    def __init__(self, fields, max_gap=PLAN_MERGE_GAP):
+        self.fields = dict(fields)
+        groups = []
+        group = None
+        for name, addr in sorted(fields.items(), key=lambda field: field[1]):
+            if group is not None and addr < group['end']:
+                raise ValueError(f"Field '{name}' overlaps another field at 0x{addr:08X}")
+            if group is None or addr - group['end'] > max_gap:
+                group = {'start': addr, 'end': addr, 'names': [], 'format': '<'}
+                groups.append(group)
+            gap = addr - group['end']
+            group['format'] += f"{gap}xi" if gap else "i"
+            group['names'].append(name)
+            group['end'] = addr + INT_STRUCT.size
+
+        # (start, buffer, struct, names) per read
+        self.reads = [
+            (group['start'], bytearray(group['end'] - group['start']), struct.Struct(group['format']), group['names'])
+            for group in groups
+        ]
+
+    def read(self, source):
+        """Dict of field name -> value, raises MemoryReadError if any read comes back short"""
+        values = {}
+        for start, buffer, layout, names in self.reads:
+            if source.read_into(start, buffer) < len(buffer):
+                raise MemoryReadError(f"Short read at 0x{start:08X} ({len(buffer)} bytes)")
+            values.update(zip(names, layout.unpack_from(buffer)))
+        return values
+
+    def __len__(self):
+        """Read calls per read()"""
+        return len(self.reads)
+
+
+# Readable spans per process (keyed by MemorySource.cache_key()), see region_map()
+_region_maps = {}
+
+
+def merge_regions(regions):
+    """Sorted (start, end) spans of the regions, with back to back regions joined"""
+    spans = []
+    for region in sorted(regions, key=lambda region: region.base):
+        start = region.base
+        end = region.base + region.size
+        if spans and spans[-1][1] >= start:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], end))
+        else:
+            spans.append((start, end))
+    return spans
+
+
+def clip_spans(spans, start_addr, end_addr):
+    """The parts of spans that fall inside [start_addr, end_addr)"""
+    clipped = []
+    for start, end in spans:
+        start = max(start, start_addr)
+        end = min(end, end_addr)
+        if start < end:
+            clipped.append((start, end))
+    return clipped
+
+
+def region_map(source, refresh=False):
+    """Readable (start, end) spans of source, enumerated once and cached by PID
+
+    Call with refresh=True at the start of a scan session. Returns None when
+    the source can't list its regions (callers fall back to blind chunks).
+    """
+    key = source.cache_key()
+    spans = None if refresh else _region_maps.get(key)
+    if spans is None:
+        try:
+            spans = merge_regions(source.regions())
+        except Exception:
+            _region_maps.pop(key, None)
+            return None
+        _region_maps[key] = spans
+    return spans
+
+
+def forget_region_map(key):
+    """Drop the cached region map for key (a MemorySource.cache_key(), e.g. the PID of an exited process)"""
+    _region_maps.pop(key, None)
+
+
+def open_source_spec(spec):
+    """Open a source from MemorySource.spec() output"""
+    source_class, args = spec
+    return source_class(*args)
+
+
+def open_memory_source(pid):
+    """Open the live-process backend that fits this platform"""
+    if sys.platform == 'win32':
+        return PymemMemorySource(pid)
+    return ProcMemorySource(pid)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Cindy Mobs - The whole mob table in one read
+cindycore models a single mob at MOB_BASE_ADDR, but the mob range holds an array
+of mob records with a fixed stride. MobTable works out the stride and count from
+mob scan results and reads every record per tick into a numpy structured array,
+so 50 mobs cost one read just like one mob.
+
+  table = cindy_mobs.discover_table(source, bot_module.MOB_BASE_ADDR)
+  mobs = table.read(source)          # structured array, one row per mob
+  mobs['x'], mobs['y'], mobs['kill'] # vectorized views over all mobs
+"""
+
+from collections import Counter
+
+import cindy_config
+import cindy_scanner
+from cindy_memory import MemoryReadError
+
+# Try to import numpy for the structured array
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Field offsets from a record's face address (same layout as cindycore around MOB_BASE_ADDR)
+MOB_FIELD_OFFSETS = {
+    'face': 0x0,
+    'y': 0x4,
+    'x': 0x8,
+    'spawn_face': -0x14,
+    'spawn_y': -0x10,
+    'spawn_x': -0xC,
+    'id': 0x98,
+    'kill': 0x9C,
+}
+
+# Records start at their lowest field
+RECORD_START = min(MOB_FIELD_OFFSETS.values())
+
+# Slots that don't match the mob pattern (dead / empty) still belong to the table
+MAX_MISSING_RECORDS = 4
+
+if NUMPY_AVAILABLE:
+    # One record, fields at their offset from RECORD_START. The table stride can be
+    # smaller than this (records then overlap), the array view handles that.
+    MOB_RECORD = np.dtype({
+        'names': list(MOB_FIELD_OFFSETS),
+        'formats': ['<i4'] * len(MOB_FIELD_OFFSETS),
+        'offsets': [offset - RECORD_START for offset in MOB_FIELD_OFFSETS.values()],
+    })
+
+
+def infer_layout(addresses, base_addr):
+    """(first_addr, stride, count) of the table holding base_addr, or None
+
+    The stride is the most common gap between neighbouring matches. The table
+    grows outwards from base_addr over matches a whole number of strides away,
+    allowing up to MAX_MISSING_RECORDS unmatched slots in between.
+    """
+    addrs = sorted(set(addresses) | {base_addr})
+    gaps = [b - a for a, b in zip(addrs, addrs[1:])]
+    if not gaps:
+        return None
+    stride = Counter(gaps).most_common(1)[0][0]
+
+    aligned = [addr for addr in addrs if (addr - base_addr) % stride == 0]
+    low = high = aligned.index(base_addr)
+    max_gap = stride * (MAX_MISSING_RECORDS + 1)
+    while low > 0 and aligned[low] - aligned[low - 1] <= max_gap:
+        low -= 1
+    while high < len(aligned) - 1 and aligned[high + 1] - aligned[high] <= max_gap:
+        high += 1
+
+    count = (aligned[high] - aligned[low]) // stride + 1
+    if count < 2:
+        return None
+    return aligned[low], stride, count
+
+
+class MobTable:
+    """count mob records stride bytes apart, the first one's face at first_addr"""
+
+    def __init__(self, first_addr, stride, count, base_addr=None):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy not installed. Install with: pip install numpy")
+        self.first_addr = first_addr
+        self.stride = stride
+        self.count = count
+        self.start = first_addr + RECORD_START
+
+        # The read fills buffer in place, records is a view of it that never moves
+        self.buffer = bytearray((count - 1) * stride + MOB_RECORD.itemsize)
+        self.records = np.ndarray((count,), dtype=MOB_RECORD, buffer=self.buffer, strides=(stride,))
+
+        # Row of the mob cindycore tracks
+        self.base_index = 0 if base_addr is None else (base_addr - first_addr) // stride
+
+    def read(self, source):
+        """Read every record in one call, returns the structured array (overwritten by the next read)"""
+        if source.read_into(self.start, self.buffer) < len(self.buffer):
+            raise MemoryReadError(f"Short read of the mob table at 0x{self.start:08X}")
+        return self.records
+
+    def addresses(self):
+        """Face address of every record"""
+        return [self.first_addr + i * self.stride for i in range(self.count)]
+
+
+def discover_table(source, base_addr,
+                   start_addr=cindy_config.MOB_MEMORY_START,
+                   end_addr=cindy_config.MOB_MEMORY_END):
+    """Scan the mob range once and build the table around base_addr (a one-record table if none is found)"""
+    matches = cindy_scanner.scan_mob_range(source, start_addr, end_addr, 0)
+    layout = infer_layout([addr for addr, _, _ in matches], base_addr)
+    if layout is None:
+        return MobTable(base_addr, MOB_RECORD.itemsize, 1, base_addr)
+    return MobTable(*layout, base_addr=base_addr)
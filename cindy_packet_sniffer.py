@@ -16,7 +16,8 @@ from datetime import datetime
 from collections import defaultdict
 import sys
 import psutil
-import pymem
+
+import cindy_processes
 
 # Try to import scapy for packet capture
 try:
@@ -138,6 +139,7 @@ class PacketSniffer:
         self.attached = False
         self.process = None
         self.pid = None
+        self.process_watcher = None
         
         # Packet bridge connection
         self.bridge = None
@@ -163,14 +165,9 @@ class PacketSniffer:
         print("PROCESS ATTACHMENT")
         print("="*80)
         
-        # Find all endless.exe processes
-        endless_pids = []
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                if proc.info['name'].lower() == 'endless.exe':
-                    endless_pids.append(proc.info['pid'])
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+        # Find all endless.exe processes (oldest first, from the shared watcher)
+        self.process_watcher = cindy_processes.get_watcher()
+        endless_pids = self.process_watcher.find()
         
         if not endless_pids:
             print("ERROR: endless.exe not found. Please start Endless Online first.")
@@ -204,8 +201,8 @@ class PacketSniffer:
         
         # Try to attach
         try:
-            pm = pymem.Pymem(self.pid)
-            pm.close_process()  # Close immediately, just testing
+            # Opens the shared handle (kept open while the client runs)
+            cindy_processes.open_shared(self.pid).close()
             
             self.attached = True
             self.process = psutil.Process(self.pid)
@@ -239,7 +236,7 @@ class PacketSniffer:
             return False
         
         # Verify process is still running
-        if not self.process.is_running():
+        if not self.process_watcher.is_running(self.pid):
             print("ERROR: endless.exe process has terminated. Please reattach.")
             self.attached = False
             return False
@@ -642,11 +639,11 @@ def main():
         try:
             # Monitor process and keep running
             while sniffer.running:
-                # Check if endless.exe is still running
-                if not sniffer.process.is_running():
+                # Check if endless.exe is still running (a dict lookup, the watcher does the polling)
+                if not sniffer.process_watcher.is_running(sniffer.pid):
                     print("\n\nWARNING: endless.exe has terminated. Stopping capture...")
                     break
-                time.sleep(0.5)
+                time.sleep(0.1)
         except KeyboardInterrupt:
             print("\n\nStopping packet capture...")
         
@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+"""
+Cindy Patterns - Tiny byte-pattern language for the memory scanners
+Patterns are written once (see cindy_config.MOB_PATTERN / PLAYER_PATTERN) and
+compiled into a fast matcher, so changing a pattern after a client update is a
+config edit instead of a new if-chain.
+
+Syntax (space separated, one token per byte):
+  00 .. FF      literal byte (hex)
+  ??            any byte
+  [00-03]       byte in range (hex, inclusive)
+  =12           same value as the byte at offset 12 (decimal, earlier in the pattern)
+  TOKEN*N       repeat a token N times (decimal), e.g. 00*12
+
+Example - the mob struct:
+  [00-03] 00 00 00  [01-FF] 00 00 00  [01-FF] 00 00 00  [00-03] 00 00 00  =12 00 00 00  00*12
+
+Compiled forms:
+  numpy plan - one whole-buffer test on the most selective bytes picks candidates,
+               dword stages (most checked bits first) narrow them, then every check
+               runs dword by dword on a (candidates x length) window gather
+  re regex   - bytes regex inside a lookahead (overlapping matches), used when numpy is missing
+"""
+
+import re
+
+# Try to import numpy for the vectorized plan
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+TOKEN_PATTERN = re.compile(r'^(?:([0-9A-Fa-f]{2})|(\?\?)|\[([0-9A-Fa-f]{2})-([0-9A-Fa-f]{2})\]|=(\d+))(?:\*(\d+))?$')
+
+
+def parse_pattern(text):
+    """Parse pattern text into per-byte tokens: ('literal', v), ('any',), ('range', lo, hi) or ('same', offset)"""
+    tokens = []
+    for word in text.split():
+        match = TOKEN_PATTERN.match(word)
+        if not match:
+            raise ValueError(f"Bad pattern token '{word}'")
+        literal, wildcard, low, high, same, repeat = match.groups()
+
+        if literal is not None:
+            token = ('literal', int(literal, 16))
+        elif wildcard is not None:
+            token = ('any',)
+        elif low is not None:
+            lo, hi = int(low, 16), int(high, 16)
+            if lo > hi:
+                raise ValueError(f"Empty range in pattern token '{word}'")
+            token = ('literal', lo) if lo == hi else ('any',) if (lo, hi) == (0, 255) else ('range', lo, hi)
+        else:
+            offset = int(same)
+            if offset >= len(tokens):
+                raise ValueError(f"Pattern token '{word}' must refer to an earlier byte")
+            token = ('same', offset)
+
+        tokens.extend([token] * int(repeat or 1))
+
+    if not tokens:
+        raise ValueError("Empty pattern")
+    return tokens
+
+
+class BytePattern:
+    """A compiled byte pattern - captures maps value names to byte offsets reported for each match"""
+
+    def __init__(self, text, captures=None):
+        self.text = text
+        self.tokens = parse_pattern(text)
+        self.length = len(self.tokens)
+        self.captures = dict(captures or {})
+
+        for name, offset in self.captures.items():
+            if not 0 <= offset < self.length:
+                raise ValueError(f"Capture '{name}' at offset {offset} is outside the pattern")
+
+        self.regex = self.compile_regex()
+        self.plan = self.compile_plan() if NUMPY_AVAILABLE else None
+
+    # ---------- compilers ----------
+
+    def compile_regex(self):
+        """Bytes regex for the whole pattern, wrapped in a lookahead so overlapping matches are found"""
+        referenced = {token[1] for token in self.tokens if token[0] == 'same'}
+        parts = []
+        for offset, token in enumerate(self.tokens):
+            if token[0] == 'literal':
+                part = re.escape(bytes([token[1]]))
+            elif token[0] == 'range':
+                part = b'[' + re.escape(bytes([token[1]])) + b'-' + re.escape(bytes([token[2]])) + b']'
+            elif token[0] == 'same':
+                part = b'(?P=b%d)' % token[1]
+            else:
+                part = b'.'
+            if offset in referenced:
+                part = b'(?P<b%d>' % offset + part + b')'
+            parts.append(part)
+        return re.compile(b'(?=' + b''.join(parts) + b')', re.DOTALL)
+
+    def compile_plan(self):
+        """Checks for the vectorized matcher: the anchor used to pick candidates, the dword filter
+        stages that narrow them and the window check (whole dwords where exact, bytes elsewhere)"""
+        anchor = self.choose_anchor()
+        folded, stages = self.choose_stages(anchor)
+        verified = self.anchored_groups(anchor) | {offset for offset, *_ in stages}
+        if anchor is not None and anchor[0] == 'dword':
+            verified |= {anchor[1] + delta for delta in folded}
+
+        # Aligned 4-byte groups checked as one masked dword range each - groups the anchor
+        # or a stage already checked (and groups with nothing to check) pass anything
+        words = self.length // 4
+        masks = [0xFFFFFFFF] * words
+        lo = [0] * words
+        hi = [0xFFFFFFFF] * words
+        covered = set()
+        checked = False
+        for col in range(words):
+            group = self.dword_check(col * 4)
+            if group is None:
+                continue
+            covered |= {col * 4 + i for i in range(4) if group[0] >> (8 * i) & 0xFF}
+            if col * 4 not in verified:
+                masks[col], lo[col], hi[col] = group
+                checked = True
+
+        literal_cols = [i for i, t in enumerate(self.tokens) if t[0] == 'literal' and i not in covered]
+        range_cols = [i for i, t in enumerate(self.tokens) if t[0] == 'range' and i not in covered]
+        return {
+            'dword_check': checked,
+            # None when nothing needs masking / no range starts above zero - one numpy op less each
+            'dword_masks': None if all(mask == 0xFFFFFFFF for mask in masks) else np.array(masks, dtype=np.uint32),
+            'dword_lo': None if not any(lo) else np.array(lo, dtype=np.uint32),
+            'dword_span': np.array([h - l for l, h in zip(lo, hi)], dtype=np.uint32),
+            'literal_cols': np.array(literal_cols, dtype=np.intp),
+            'literal_vals': np.array([self.tokens[i][1] for i in literal_cols], dtype=np.uint8),
+            'range_cols': np.array(range_cols, dtype=np.intp),
+            'range_lo': np.array([self.tokens[i][1] for i in range_cols], dtype=np.uint8),
+            'range_span': np.array([self.tokens[i][2] - self.tokens[i][1] for i in range_cols], dtype=np.uint8),
+            'same_pairs': [(i, t[1]) for i, t in enumerate(self.tokens) if t[0] == 'same'],
+            'anchor': anchor,
+            'folded': folded,
+            'stages': stages,
+        }
+
+    def choose_anchor(self):
+        """Pick the cheapest selective whole-buffer test
+
+        Non-zero literal bytes win (they're rare in memory), compared as contiguous
+        byte slices. Otherwise use the 4-byte group that rejects an all-zero dword
+        and can be tested as one masked dword range.
+        """
+        nonzero = [i for i, t in enumerate(self.tokens) if t[0] == 'literal' and t[1] != 0]
+        if nonzero:
+            return ('bytes', [(i, self.tokens[i][1]) for i in nonzero[-2:]])
+
+        best = None
+        for offset in range(self.length - 3):
+            group = self.dword_check(offset)
+            if group is None:
+                continue
+            mask, lo, hi = group
+            score = (lo > 0) * 100 + bin(mask).count('1') // 8
+            if best is None or score > best[0]:
+                best = (score, offset, mask, lo, hi)
+
+        if best is None:
+            return None
+        _, offset, mask, lo, hi = best
+        return ('dword', offset, mask, lo, hi)
+
+    def choose_stages(self, anchor):
+        """(folded, stages) - dword checks that narrow the anchor's candidates before the window gather
+
+        One per aligned 4-byte group the anchor doesn't cover that rejects an
+        all-zero dword, most checked bits first. Zero-accepting groups pass most
+        of memory, so they're left to the window check - on the few candidates
+        left, one more numpy call costs more than it saves. A later group with
+        the same check as a dword anchor is folded into the anchor instead: its
+        whole-buffer test is already there, shifted (folded holds the shifts).
+        """
+        anchored = self.anchored_groups(anchor)
+        folded = []
+        stages = []
+        for offset in range(0, self.length - 3, 4):
+            group = self.dword_check(offset)
+            if offset in anchored or group is None or group[1] == 0:
+                continue
+            if anchor[0] == 'dword' and offset > anchor[1] and group == anchor[2:]:
+                folded.append(offset - anchor[1])
+            else:
+                stages.append((bin(group[0]).count('1'), offset) + group)
+        stages.sort(key=lambda stage: -stage[0])
+        return folded, [stage[1:] for stage in stages]
+
+    def anchored_groups(self, anchor):
+        """Offsets of the aligned 4-byte groups the anchor test fully checks"""
+        if anchor is None:
+            return set()
+        if anchor[0] == 'dword':
+            return {anchor[1]} if anchor[1] % 4 == 0 else set()
+        anchored = set()
+        tested = {col for col, _ in anchor[1]}
+        for offset in range(0, self.length - 3, 4):
+            group = self.dword_check(offset)
+            if group is not None and all(offset + i in tested for i in range(4) if group[0] >> (8 * i) & 0xFF):
+                anchored.add(offset)
+        return anchored
+
+    def dword_check(self, offset):
+        """(mask, lo, hi) so that bytes offset..offset+3 pass iff lo <= (dword & mask) <= hi, or None
+
+        Only exact when every checked byte above the lowest one is a literal. A
+        same-as byte is checked against the range of the byte it copies (it
+        can't pass otherwise) - the equality itself is left to the same pairs.
+        """
+        mask = lo = hi = 0
+        lowest = True
+        for i in range(4):
+            token = self.tokens[offset + i]
+            while token[0] == 'same':
+                token = self.tokens[token[1]]
+            shift = 8 * i
+            if token[0] == 'any':
+                continue
+            if token[0] == 'range':
+                if not lowest:
+                    return None
+                lo |= token[1] << shift
+                hi |= token[2] << shift
+            else:
+                lo |= token[1] << shift
+                hi |= token[1] << shift
+            mask |= 0xFF << shift
+            lowest = False
+        if mask == 0:
+            return None
+        return mask, lo, hi
+
+    # ---------- matching ----------
+
+    def match_at(self, buffer, offset):
+        """Plain Python check of one offset"""
+        if offset < 0 or offset + self.length > len(buffer):
+            return False
+        for i, token in enumerate(self.tokens):
+            value = buffer[offset + i]
+            kind = token[0]
+            if kind == 'literal':
+                if value != token[1]:
+                    return False
+            elif kind == 'range':
+                if not token[1] <= value <= token[2]:
+                    return False
+            elif kind == 'same':
+                if value != buffer[offset + token[1]]:
+                    return False
+        return True
+
+    def values_at(self, buffer, offset):
+        """Captured values of the match at offset"""
+        return {name: buffer[offset + i] for name, i in self.captures.items()}
+
+    def find_rows(self, buffer):
+        """(offsets, rows) of every match - rows holds the matched bytes (numpy only)"""
+        data = buffer if isinstance(buffer, np.ndarray) else np.frombuffer(buffer, dtype=np.uint8)
+        count = len(data) - self.length + 1
+        if count <= 0:
+            return np.empty(0, dtype=np.intp), np.empty((0, self.length), dtype=np.uint8)
+
+        plan = self.plan
+        candidates = self.anchor_candidates(data, count, plan['anchor'], plan['folded'])
+
+        # Narrow column by column (4 bytes per candidate) before gathering whole windows
+        for offset, dword_mask, lo, hi in plan['stages']:
+            if len(candidates) == 0:
+                break
+            dwords = np.ndarray(shape=(count,), dtype='<u4', buffer=data, offset=offset, strides=(1,))[candidates]
+            if dword_mask != 0xFFFFFFFF:
+                dwords &= np.uint32(dword_mask)
+            candidates = candidates[(dwords - np.uint32(lo)) <= np.uint32(hi - lo)]
+
+        # Row i = the pattern-length window at candidate i, one gather for all checks
+        windows = np.ndarray(shape=(count, self.length), dtype=np.uint8, buffer=data, strides=(1, 1))
+        rows = windows[candidates]
+
+        if plan['dword_check']:
+            words = np.ascontiguousarray(rows[:, :self.length // 4 * 4]).view('<u4')
+            if plan['dword_masks'] is not None:
+                words = words & plan['dword_masks']
+            if plan['dword_lo'] is not None:
+                words = words - plan['dword_lo']
+            keep = rows_all(words <= plan['dword_span'])
+        else:
+            keep = np.ones(len(rows), dtype=bool)
+        if len(plan['literal_cols']):
+            keep &= (rows[:, plan['literal_cols']] == plan['literal_vals']).all(axis=1)
+        if len(plan['range_cols']):
+            keep &= ((rows[:, plan['range_cols']] - plan['range_lo']) <= plan['range_span']).all(axis=1)
+        for col, ref in plan['same_pairs']:
+            keep &= rows[:, col] == rows[:, ref]
+
+        return candidates[keep], rows[keep]
+
+    def anchor_candidates(self, data, count, anchor, folded=()):
+        """Offsets that pass the anchor test over the whole buffer - and, for a dword anchor,
+        the same test folded shifts further on"""
+        if anchor is None:
+            return np.arange(count)
+
+        if anchor[0] == 'bytes':
+            mask = None
+            for col, value in anchor[1]:
+                test = data[col:col + count] == value
+                mask = test if mask is None else mask & test
+            return mask.nonzero()[0]
+
+        # Tested past count too, so the folded shifts can be read from the same test
+        _, offset, dword_mask, lo, hi = anchor
+        length = len(data) - offset - 3
+        if dword_mask == 0xFFFFFFFF and hi <= 0xFF:
+            # Low byte in range, upper three zero - contiguous byte ops beat the unaligned dword view
+            test = (data[offset + 1:offset + 1 + length] | data[offset + 2:offset + 2 + length]
+                    | data[offset + 3:offset + 3 + length]) == 0
+            low = data[offset:offset + length]
+            if lo == 0:
+                test &= low <= hi
+            elif hi == 0xFF:
+                test &= low >= lo
+            else:
+                test &= (low - np.uint8(lo)) <= np.uint8(hi - lo)
+        else:
+            dwords = np.ndarray(shape=(length,), dtype='<u4', buffer=data, offset=offset, strides=(1,))
+            if dword_mask != 0xFFFFFFFF:
+                dwords = dwords & np.uint32(dword_mask)
+            test = (dwords - np.uint32(lo)) <= np.uint32(hi - lo)
+
+        mask = test[:count]
+        for delta in folded:
+            mask = mask & test[delta:delta + count]
+        return mask.nonzero()[0]
+
+    def find(self, buffer):
+        """List of every offset in buffer where the pattern matches"""
+        if self.plan is not None:
+            return self.find_rows(buffer)[0].tolist()
+        return [match.start() for match in self.regex.finditer(bytes(buffer))]
+
+    def match_buffer(self, buffer, base_addr):
+        """Every match in buffer as (addr, None, captured_values) tuples"""
+        if self.plan is None:
+            return [
+                (base_addr + offset, None, self.values_at(buffer, offset))
+                for offset in self.find(buffer)
+            ]
+
+        offsets, rows = self.find_rows(buffer)
+        if len(offsets) == 0:
+            return []
+
+        names = list(self.captures)
+        columns = rows[:, [self.captures[name] for name in names]].tolist()
+        return [
+            (base_addr + offset, None, dict(zip(names, values)))
+            for offset, values in zip(offsets.tolist(), columns)
+        ]
+
+
+def rows_all(test):
+    """test.all(axis=1) - rows of 2, 4 or 8 flags are compared as one integer each (far cheaper on few rows)"""
+    width = test.shape[1]
+    if width in (2, 4, 8) and test.flags.c_contiguous:
+        return test.view(f'<u{width}')[:, 0] == int.from_bytes(b'\x01' * width, 'little')
+    return test.all(axis=1)
+
+
+def compile_pattern(text, captures=None):
+    """Compile pattern text into a BytePattern"""
+    return BytePattern(text, captures)
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Cindy Pointers - Static pointer chains to the scanned addresses
+The mob and player structs move when the client restarts, but something inside
+endless.exe (or one of its dlls) still points at them. After a scan finds an
+address we search backwards for module + offset -> [pointer] + offset ... chains
+that end on it and save the shortest ones. On the next start the chains are
+followed again - a handful of 4-byte reads instead of a full rescan.
+
+Chain file (JSON, next to the address file, e.g. cindys_baby_daddy_ptrs.json):
+  {"address": "0x04A1B2C0",
+   "chains": [{"module": "endless.exe", "offset": "0x0012F3A8", "offsets": ["0x10", "0x1C"]}]}
+
+Resolving a chain:
+  addr = module base + offset
+  for each entry in offsets: addr = read_pointer(addr) + entry
+"""
+
+import os
+import json
+import bisect
+import struct
+from collections import namedtuple
+
+import cindy_config
+import cindy_memory
+import cindy_scanner
+
+# Try to import numpy for the pointer map
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# The client is 32-bit
+POINTER_STRUCT = struct.Struct('<I')
+POINTER_SIZE = POINTER_STRUCT.size
+
+# Read size while building the pointer map (keeps the temporary arrays small)
+POINTER_READ_SIZE = 4 * 1024 * 1024
+
+# Nodes kept per search level - stops heap-heavy levels from exploding
+MAX_LEVEL_NODES = 20000
+
+# module name, offset of the first pointer from the module base, offset added after each hop
+PointerChain = namedtuple('PointerChain', ['module', 'offset', 'offsets'])
+
+
+def build_pointer_map(source, spans):
+    """(values, locations) of every aligned dword in spans that points into spans, sorted by value"""
+    starts = np.array([start for start, _ in spans], dtype=np.int64)
+    ends = np.array([end for _, end in spans], dtype=np.int64)
+    values = []
+    locations = []
+
+    for span_start, span_end in spans:
+        for addr, buffer in cindy_scanner.read_chunks(source, span_start, span_end, POINTER_READ_SIZE):
+            dwords = np.frombuffer(buffer, dtype='<u4', count=len(buffer) // POINTER_SIZE)
+
+            # Cheap bounds test first, the region lookup only runs on what survives
+            hits = np.flatnonzero((dwords >= starts[0]) & (dwords < ends[-1]))
+            targets = dwords[hits].astype(np.int64)
+            index = np.searchsorted(starts, targets, side='right') - 1
+            inside = targets < ends[index]
+
+            values.append(targets[inside])
+            locations.append(addr + hits[inside].astype(np.int64) * POINTER_SIZE)
+
+    if not values:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    values = np.concatenate(values)
+    locations = np.concatenate(locations)
+    order = np.argsort(values, kind='stable')
+    return values[order], locations[order]
+
+
+def module_at(modules, addr):
+    """Module whose image contains addr, or None (modules sorted by base)"""
+    i = bisect.bisect_right([module.base for module in modules], addr) - 1
+    if i >= 0 and addr < modules[i].base + modules[i].size:
+        return modules[i]
+    return None
+
+
+def find_pointer_chains(source, target,
+                        max_depth=cindy_config.POINTER_MAX_DEPTH,
+                        max_offset=cindy_config.POINTER_MAX_OFFSET,
+                        max_chains=cindy_config.POINTER_MAX_CHAINS):
+    """Shortest static pointer chains that lead to target, best first
+
+    Breadth-first from the target: each level holds the addresses that point
+    (within max_offset) at a node of the level before. A node inside a module
+    image ends a chain.
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy not installed. Install with: pip install numpy")
+
+    modules = sorted(source.modules(), key=lambda module: module.base)
+    spans = cindy_memory.region_map(source)
+    if spans is None:
+        raise RuntimeError("Memory source can't list its regions")
+    values, locations = build_pointer_map(source, spans)
+
+    # node -> (node it points at, offset added after the hop)
+    links = {}
+    visited = {target}
+    frontier = [target]
+    chains = []
+
+    for depth in range(max_depth + 1):
+        level_chains = []
+        expand = []
+        for node in frontier:
+            module = module_at(modules, node)
+            if module is None:
+                expand.append(node)
+                continue
+
+            offsets = []
+            step = node
+            while step in links:
+                step, offset = links[step]
+                offsets.append(offset)
+            level_chains.append(PointerChain(module.name, node - module.base, offsets))
+
+        # Same length - smaller struct offsets are the likelier real ones
+        level_chains.sort(key=lambda chain: sum(chain.offsets))
+        chains.extend(level_chains)
+        if len(chains) >= max_chains or depth == max_depth:
+            break
+
+        frontier = []
+        for node in expand:
+            low = np.searchsorted(values, node - max_offset, side='left')
+            high = np.searchsorted(values, node, side='right')
+            for value, location in zip(values[low:high].tolist(), locations[low:high].tolist()):
+                if location in visited:
+                    continue
+                visited.add(location)
+                links[location] = (node, node - value)
+                frontier.append(location)
+            if len(frontier) >= MAX_LEVEL_NODES:
+                break
+        if not frontier:
+            break
+
+    return chains[:max_chains]
+
+
+def find_module(modules, name):
+    """Module by name (case-insensitive), or None"""
+    name = name.lower()
+    for module in modules:
+        if module.name.lower() == name:
+            return module
+    return None
+
+
+def resolve_chain(source, chain, modules):
+    """Follow chain in the live process, returns the address it ends on or None"""
+    module = find_module(modules, chain.module)
+    if module is None:
+        return None
+    addr = module.base + chain.offset
+    try:
+        for offset in chain.offsets:
+            addr = POINTER_STRUCT.unpack(source.read_bytes(addr, POINTER_SIZE))[0] + offset
+    except Exception:
+        return None
+    return addr
+
+
+def resolve_chains(source, chains, check=None):
+    """First (address, chain) whose address passes check(address), or (None, None)"""
+    modules = source.modules()
+    for chain in chains:
+        addr = resolve_chain(source, chain, modules)
+        if addr is not None and (check is None or check(addr)):
+            return addr, chain
+    return None, None
+
+
+def follow_saved_chains(source, address_file, pattern):
+    """Live address for address_file from its saved chains (must match pattern there), or None"""
+    chains = load_chains(chain_file(address_file))
+    if not chains:
+        return None
+
+    def check(addr):
+        try:
+            return pattern.match_at(source.read_bytes(addr, pattern.length), 0)
+        except Exception:
+            return False
+
+    addr, _ = resolve_chains(source, chains, check)
+    return addr
+
+
+def chain_file(address_file):
+    """Chain file that belongs to an address file (cindys_ex_bf.txt -> cindys_ex_bf_ptrs.json)"""
+    root, _ = os.path.splitext(address_file)
+    return f"{root}_ptrs.json"
+
+
+def save_chains(path, address, chains):
+    """Write chains (and the address they were found for) to path"""
+    data = {
+        'address': f"0x{address:08X}",
+        'chains': [
+            {
+                'module': chain.module,
+                'offset': f"0x{chain.offset:08X}",
+                'offsets': [f"0x{offset:X}" for offset in chain.offsets],
+            }
+            for chain in chains
+        ],
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def load_chains(path):
+    """Chains saved at path, [] if there are none"""
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return [
+            PointerChain(entry['module'], int(entry['offset'], 16), [int(offset, 16) for offset in entry['offsets']])
+            for entry in data.get('chains', [])
+        ]
+    except Exception:
+        return []
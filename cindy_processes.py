@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""
+Cindy Processes - Cached endless.exe locator and client start / exit events
+One ProcessWatcher keeps the set of running clients. Finding a client is a dict
+lookup instead of a walk over every process on the box, and whoever cares (bot
+loop, session manager, sniffer) subscribes to ProcessStarted / ProcessExited.
+
+Refreshing is incremental: only PIDs that weren't there last time get their
+name looked up, with a full process_iter(attrs) walk every so often to catch
+reused PIDs. Known clients are checked much more often than that (a couple of
+syscalls each), so an exit is noticed within PROCESS_ALIVE_INTERVAL.
+
+  watcher = cindy_processes.get_watcher()     # shared, starts its thread on first use
+  watcher.find()                               # [pid, ...] oldest client first
+  exits = watcher.bus.subscribe(kinds=(ProcessExited,))
+
+HandlePool keeps one memory source (process handle) per client open for as
+long as the client runs. Scanner, bot and tools each take a reference and
+close() it when done - the handle itself is only closed once the client has
+exited and the last reference is gone.
+
+  with cindy_processes.open_shared(pid) as source:
+      ...
+"""
+
+import time
+import threading
+from collections import namedtuple
+
+import psutil
+
+import cindy_config
+import cindy_memory
+from cindy_memory import MemorySource
+from cindy_events import EventBus
+
+ProcessStarted = namedtuple('ProcessStarted', ['time', 'pid', 'create_time'])
+ProcessExited = namedtuple('ProcessExited', ['time', 'pid'])
+
+# Incremental refreshes between full process walks
+FULL_REFRESH_EVERY = 30
+
+
+class ProcessWatcher:
+    """Running clients by PID, kept up to date by refresh() / check_alive() or a background thread"""
+
+    def __init__(self, name=cindy_config.CLIENT_PROCESS_NAME, bus=None,
+                 alive_interval=cindy_config.PROCESS_ALIVE_INTERVAL,
+                 scan_interval=cindy_config.PROCESS_SCAN_INTERVAL):
+        self.name = name.lower()
+        self.bus = bus or EventBus()
+        self.alive_interval = alive_interval
+        self.scan_interval = scan_interval
+
+        # Clients: pid -> create_time (tells a reused PID apart)
+        self.clients = {}
+        # Every PID looked at so far
+        self.seen = set()
+        self.refreshes = 0
+
+        self.lock = threading.Lock()
+        self.thread = None
+        self.running = False
+
+    def refresh(self):
+        """Look for started / exited clients, returns (and publishes) the events"""
+        with self.lock:
+            if self.refreshes % FULL_REFRESH_EVERY == 0:
+                events = self._full_refresh()
+            else:
+                events = self._incremental_refresh()
+            self.refreshes += 1
+        if events:
+            self.bus.publish(events)
+        return events
+
+    def _full_refresh(self):
+        now = time.monotonic()
+        found = {}
+        seen = set()
+        for proc in psutil.process_iter(['name', 'create_time']):
+            seen.add(proc.pid)
+            if (proc.info['name'] or '').lower() == self.name:
+                found[proc.pid] = proc.info['create_time']
+        self.seen = seen
+        return self._apply(found, now)
+
+    def _incremental_refresh(self):
+        now = time.monotonic()
+        current = set(psutil.pids())
+        found = {pid: create_time for pid, create_time in self.clients.items() if pid in current}
+        for pid in current - self.seen:
+            try:
+                proc = psutil.Process(pid)
+                with proc.oneshot():
+                    if proc.name().lower() == self.name:
+                        found[pid] = proc.create_time()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        self.seen = current
+        return self._apply(found, now)
+
+    def _apply(self, found, now):
+        """Swap in the new client set, events for the difference"""
+        events = []
+        for pid, create_time in self.clients.items():
+            if found.get(pid) != create_time:
+                events.append(ProcessExited(now, pid))
+        for pid, create_time in found.items():
+            if self.clients.get(pid) != create_time:
+                events.append(ProcessStarted(now, pid, create_time))
+        self.clients = found
+        return events
+
+    def check_alive(self):
+        """Quick check of the known clients only - returns (and publishes) exit events"""
+        now = time.monotonic()
+        events = []
+        with self.lock:
+            clients = dict(self.clients)
+            for pid, create_time in self.clients.items():
+                try:
+                    if create_time is None:
+                        # Couldn't read it when the client was found - existence is all we can check
+                        alive = psutil.pid_exists(pid)
+                    else:
+                        alive = psutil.Process(pid).create_time() == create_time
+                except psutil.NoSuchProcess:
+                    alive = False
+                except psutil.AccessDenied:
+                    # Elevated / other session client - still running as long as the PID is there
+                    alive = psutil.pid_exists(pid)
+                if not alive:
+                    del clients[pid]
+                    events.append(ProcessExited(now, pid))
+            self.clients = clients
+        if events:
+            self.bus.publish(events)
+        return events
+
+    def find(self):
+        """Running client PIDs, oldest first"""
+        if self.thread is None and not self.refreshes:
+            self.refresh()
+        clients = self.clients
+        return sorted(clients, key=clients.get)
+
+    def first(self):
+        """Oldest running client, or None"""
+        pids = self.find()
+        return pids[0] if pids else None
+
+    def is_running(self, pid):
+        return pid in self.clients
+
+    def start(self):
+        """Keep the client set fresh from a background thread"""
+        if self.thread is not None:
+            return
+        self.refresh()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        next_scan = time.monotonic() + self.scan_interval
+        while self.running:
+            time.sleep(self.alive_interval)
+            try:
+                if time.monotonic() >= next_scan:
+                    next_scan = time.monotonic() + self.scan_interval
+                    self.refresh()
+                else:
+                    self.check_alive()
+            except Exception as e:
+                print(f"Warning: Process watcher error: {e}")
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def get_watcher():
+    """The shared watcher, started on first use"""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = ProcessWatcher()
+            _watcher.start()
+        return _watcher
+
+
+class PooledSource(MemorySource):
+    """One reference to a pooled source - reads go straight to the shared handle, close() gives it back"""
+
+    def __init__(self, pool, entry):
+        super().__init__(entry.source.pid)
+        self.pool = pool
+        self.entry = entry
+        self.source = entry.source
+        # Bound methods of the shared source, no extra call per read
+        self.read_into = entry.source.read_into
+        self.regions = entry.source.regions
+
+    def modules(self):
+        return self.entry.modules()
+
+    def spec(self):
+        return self.source.spec()
+
+    def cache_key(self):
+        return self.source.cache_key()
+
+    def generation(self):
+        # The watcher already knows when the client started
+        if self.entry is not None and self.entry.create_time is not None:
+            return self.entry.create_time
+        return self.source.generation()
+
+    @property
+    def valid(self):
+        """False once the client exited or this reference was closed (acquire again after a restart)"""
+        self.pool.check_exits()
+        entry = self.entry
+        return entry is not None and entry.valid
+
+    def close(self):
+        if self.entry is not None:
+            self.pool.release(self.entry)
+            self.entry = None
+
+
+class _PoolEntry:
+    """Shared source of one client plus its reference count"""
+
+    def __init__(self, source, create_time):
+        self.source = source
+        self.create_time = create_time
+        self.refs = 0
+        self.valid = True
+        self.module_list = None
+
+    def modules(self):
+        # Module list only changes with the process, enumerate it once
+        if self.module_list is None:
+            self.module_list = self.source.modules()
+        return self.module_list
+
+
+class HandlePool:
+    """One long-lived memory source per client PID, shared by every thread
+
+    acquire() hands out PooledSource references. An entry is dropped when the
+    watcher reports its client exited (or the PID now belongs to a newer
+    process); its handle is closed when the last reference is released, so a
+    thread still reading never has the handle closed under it.
+    """
+
+    def __init__(self, watcher=None, opener=cindy_memory.open_memory_source):
+        self.watcher = watcher or get_watcher()
+        self.opener = opener
+        self.exits = self.watcher.bus.subscribe(kinds=(ProcessExited,))
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.opened = 0
+
+    def acquire(self, pid):
+        """Reference to pid's shared source, opens the handle if there isn't one yet"""
+        with self.lock:
+            self._drain_exits()
+
+            create_time = self.watcher.clients.get(pid)
+            entry = self.entries.get(pid)
+            if entry is not None and None not in (create_time, entry.create_time) and create_time != entry.create_time:
+                # Same PID, different process
+                self._invalidate(pid)
+                entry = None
+
+            if entry is None:
+                entry = _PoolEntry(self.opener(pid), create_time)
+                self.entries[pid] = entry
+                self.opened += 1
+            entry.refs += 1
+        return PooledSource(self, entry)
+
+    def release(self, entry):
+        with self.lock:
+            # An exit published since the last acquire() closes the handle right here
+            self._drain_exits()
+            entry.refs -= 1
+            if entry.refs == 0 and not entry.valid:
+                entry.source.close()
+
+    def check_exits(self):
+        """Drop the entries of clients the watcher has reported as exited"""
+        if len(self.exits):
+            with self.lock:
+                self._drain_exits()
+
+    def _drain_exits(self):
+        for event in self.exits.drain():
+            self._invalidate(event.pid)
+
+    def invalidate(self, pid):
+        """Drop pid's handle (closed as soon as nobody holds it)"""
+        with self.lock:
+            self._invalidate(pid)
+
+    def _invalidate(self, pid):
+        entry = self.entries.pop(pid, None)
+        if entry is None:
+            return
+        entry.valid = False
+        cindy_memory.forget_region_map(entry.source.cache_key())
+        if entry.refs == 0:
+            entry.source.close()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, pid):
+        return pid in self.entries
+
+    def close(self):
+        """Drop every handle and stop listening for exits"""
+        with self.lock:
+            for pid in list(self.entries):
+                self._invalidate(pid)
+        self.watcher.bus.unsubscribe(self.exits)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """The shared handle pool (on the shared watcher)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HandlePool(get_watcher())
+        return _pool
+
+
+def open_shared(pid):
+    """Shared memory source for pid - close() when done, the handle stays open for the next user"""
+    return get_pool().acquire(pid)
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+Cindy Replay - Record the bot loop's memory reads and play them back
+RecordingSource wraps the live source and logs every tick's reads; ReplaySource
+is a MemorySource that serves them back, so the poller, events and mob tracking
+run on identical input every time - on Linux, without a client.
+
+Log format (little-endian):
+  b'CNDYPOLL'  uint32 header length  header (JSON)
+  records: float64 monotonic timestamp + the bytes of every range, in order
+
+The header holds the ranges read per tick ([[addr, size], ...]) plus whatever
+the recorder was given to rebuild the poller (ReadPlan fields, mob table
+layout). Every record has the same size, so record n sits at a fixed offset.
+When the ranges change (addresses reloaded, mob table rediscovered) the
+recorder starts a new log - cindy_poll_1.log, cindy_poll_2.log, ... - each one
+replayable on its own.
+
+  source = RecordingSource(live_source, 'cindy_poll.log', meta)
+  ...
+  poller.poll(source)
+  source.end_tick()                # or source.discard_tick() if the poll failed
+  source.set_meta(new_meta)        # the poller was rebuilt - next tick starts a new log
+
+  python cindy_replay.py cindy_poll.log            # as fast as possible
+  python cindy_replay.py cindy_poll.log --speed 1  # at recorded speed
+"""
+
+import os
+import json
+import time
+import struct
+import argparse
+
+import cindy_memory
+from cindy_memory import MemorySource, MemoryRegion, MemoryReadError
+
+LOG_MAGIC = b'CNDYPOLL'
+HEADER_LENGTH = struct.Struct('<I')
+TIMESTAMP = struct.Struct('<d')
+
+
+class ReplayFinished(MemoryReadError):
+    """Raised by ReplaySource once every record has been served"""
+    pass
+
+
+class RecordingSource(MemorySource):
+    """Passes reads through to source and appends each tick's reads to a log
+
+    The first tick of a log fixes its ranges. A tick that reads other ranges
+    closes the log and starts the next segment (see segment_path()), so ticks
+    after an address reload are still recorded.
+    """
+
+    def __init__(self, source, path, meta=None):
+        super().__init__(source.pid)
+        self.source = source
+        self.path = path
+        self.meta = meta or {}
+
+        self.file = None
+        self.ranges = None
+        self.pending = []
+        self.recorded = 0
+        # Logs written so far, segment n is paths[n]
+        self.paths = []
+
+    def read_into(self, addr, buffer):
+        count = self.source.read_into(addr, buffer)
+        self.pending.append((addr, bytes(memoryview(buffer).cast('B')[:count])))
+        return count
+
+    def end_tick(self, now=None):
+        """Write the reads since the last end_tick() as one record"""
+        now = time.monotonic() if now is None else now
+        pending, self.pending = self.pending, []
+        ranges = [(addr, len(data)) for addr, data in pending]
+        if not ranges:
+            return
+
+        if self.file is not None and ranges != self.ranges:
+            print(f"Recording: reads changed, continuing in {segment_path(self.path, len(self.paths))}")
+            self.end_segment()
+        if self.file is None:
+            self.ranges = ranges
+            path = segment_path(self.path, len(self.paths))
+            header = json.dumps({'ranges': ranges, 'meta': self.meta}).encode('utf-8')
+            self.file = open(path, 'wb')
+            self.file.write(LOG_MAGIC + HEADER_LENGTH.pack(len(header)) + header)
+            self.paths.append(path)
+
+        self.file.write(TIMESTAMP.pack(now) + b''.join(data for _, data in pending))
+        self.recorded += 1
+
+    def discard_tick(self):
+        """Forget the reads since the last end_tick() (the tick failed)"""
+        self.pending = []
+
+    def set_meta(self, meta):
+        """New poller setup (the read plan was rebuilt) - the next tick starts a new segment with it"""
+        self.meta = meta or {}
+        self.end_segment()
+
+    def end_segment(self):
+        """Close the current log, the next end_tick() opens the next one"""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def regions(self):
+        return self.source.regions()
+
+    def modules(self):
+        return self.source.modules()
+
+    def cache_key(self):
+        return self.source.cache_key()
+
+    def generation(self):
+        return self.source.generation()
+
+    def close(self):
+        self.end_segment()
+        self.source.close()
+
+
+def segment_path(path, index):
+    """Log file of segment index (0 is path itself, then cindy_poll_1.log, ...)"""
+    if index == 0:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}_{index}{ext}"
+
+
+def read_log_header(f):
+    """(ranges, meta, record size) from an open log, leaves f at the first record"""
+    if f.read(len(LOG_MAGIC)) != LOG_MAGIC:
+        raise ValueError("Not a poll log")
+    length = HEADER_LENGTH.unpack(f.read(HEADER_LENGTH.size))[0]
+    header = json.loads(f.read(length).decode('utf-8'))
+    ranges = [tuple(r) for r in header['ranges']]
+    return ranges, header.get('meta', {}), TIMESTAMP.size + sum(size for _, size in ranges)
+
+
+class ReplaySource(MemorySource):
+    """Serves a poll log back one record per tick
+
+    A tick starts when the first recorded range is read. speed=1.0 waits until
+    the record's time (relative to the first one), 2.0 plays twice as fast and
+    None plays as fast as possible. Reads outside the recorded ranges fail.
+    """
+
+    def __init__(self, path, speed=None):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        with open(path, 'rb') as f:
+            self.ranges, self.meta, self.record_size = read_log_header(f)
+            data = f.read()
+        self.data = memoryview(data)
+        self.record_count = len(data) // self.record_size
+
+        # Where each range's bytes sit inside a record
+        self.range_offsets = []
+        offset = TIMESTAMP.size
+        for addr, size in self.ranges:
+            self.range_offsets.append((addr, size, offset))
+            offset += size
+
+        self.index = -1
+        self.first_time = None
+        self.started = None
+
+    def __len__(self):
+        return self.record_count
+
+    def timestamp(self, index):
+        return TIMESTAMP.unpack_from(self.data, index * self.record_size)[0]
+
+    def next_record(self):
+        """Move to the next record, waiting for its time when replaying at speed"""
+        if self.index + 1 >= self.record_count:
+            raise ReplayFinished(f"Replay finished after {self.record_count} records")
+        self.index += 1
+        if self.speed:
+            if self.started is None:
+                self.started = time.monotonic()
+                self.first_time = self.timestamp(0)
+            due = self.started + (self.timestamp(self.index) - self.first_time) / self.speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def read_into(self, addr, buffer):
+        if addr == self.ranges[0][0] or self.index < 0:
+            self.next_record()
+
+        target = memoryview(buffer).cast('B')
+        record = self.index * self.record_size
+        for start, size, offset in self.range_offsets:
+            if start <= addr < start + size:
+                count = min(len(target), start + size - addr)
+                begin = record + offset + addr - start
+                target[:count] = self.data[begin:begin + count]
+                return count
+        raise MemoryReadError(f"0x{addr:08X} was not recorded")
+
+    def regions(self):
+        return [MemoryRegion(addr, size, 0x04) for addr, size in self.ranges]
+
+    def modules(self):
+        return []
+
+    def spec(self):
+        return (type(self), (self.path, self.speed))
+
+
+def recording_meta(read_plan, mob_table=None):
+    """What replay_poller() needs to rebuild the poller that made a recording"""
+    meta = {'fields': read_plan.fields}
+    if mob_table is not None:
+        meta['mob_table'] = [mob_table.first_addr, mob_table.stride, mob_table.count,
+                             mob_table.first_addr + mob_table.base_index * mob_table.stride]
+    return meta
+
+
+def replay_poller(replay, bus=None):
+    """MemoryPoller set up like the one that recorded replay"""
+    import cindy_events
+    mob_table = None
+    if 'mob_table' in replay.meta:
+        import cindy_mobs
+        first_addr, stride, count, base_addr = replay.meta['mob_table']
+        mob_table = cindy_mobs.MobTable(first_addr, stride, count, base_addr)
+    read_plan = cindy_memory.ReadPlan(replay.meta['fields'])
+    return cindy_events.MemoryPoller(read_plan, mob_table, bus)
+
+
+def replay(path, speed=None):
+    """Run a log through the poller and the mob tracker, print throughput"""
+    import cindy_tracker
+
+    source = ReplaySource(path, speed)
+    poller = replay_poller(source)
+    tracker = cindy_tracker.MobTracker()
+    events = poller.bus.subscribe(kinds=cindy_tracker.MOB_EVENTS)
+
+    print(f"{os.path.basename(path)}: {len(source)} ticks, {len(source.ranges)} read(s) "
+          f"/ {source.record_size} bytes per tick")
+    ticks = received = 0
+    started = time.perf_counter()
+    try:
+        while True:
+            poller.poll(source)
+            batch = events.drain()
+            tracker.handle(batch)
+            received += len(batch)
+            ticks += 1
+    except ReplayFinished:
+        pass
+    elapsed = time.perf_counter() - started
+
+    print(f"{ticks} ticks in {elapsed:.2f}s = {ticks / elapsed:,.0f} ticks/s, "
+          f"{received} mob events ({received / elapsed:,.0f}/s), {len(tracker.mobs)} mobs tracked")
+    return ticks, received
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded poll log through the bot's event pipeline")
+    parser.add_argument('log', help="poll log written by RecordingSource")
+    parser.add_argument('--speed', type=float, default=None,
+                        help="1.0 = recorded speed, 2.0 = twice as fast (default: as fast as possible)")
+    args = parser.parse_args()
+    replay(args.log, args.speed)
@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+"""
+Cindy Scanner - Memory range scanning for the mob and player structs
+Tests every byte offset of a memory range at once instead of one Python call per offset
+
+The patterns themselves live in cindy_config (MOB_PATTERN / PLAYER_PATTERN) and are
+compiled once by cindy_patterns into a numpy plan (or a bytes regex without numpy).
+This module handles chunking, seams, narrowing rescans and parallel shards.
+"""
+
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import cindy_config
+import cindy_memory
+import cindy_patterns
+
+NUMPY_AVAILABLE = cindy_patterns.NUMPY_AVAILABLE
+if NUMPY_AVAILABLE:
+    import numpy as np
+else:
+    print("Warning: numpy not installed. Scanner will use slow path. Install with: pip install numpy")
+
+# Candidates closer than this are re-read with one request instead of two
+READ_MERGE_GAP = 256
+
+# Largest single read - readable spans are read in one request up to this size
+MAX_READ_SIZE = 64 * 1024 * 1024
+
+# Blind read size for sources that can't list their regions
+SCAN_CHUNK_SIZE = 1024 * 1024
+
+# Blind read size for the (tiny) mob range
+MOB_CHUNK_SIZE = 4096
+
+# Memory sources a parallel scan worker keeps open (least recently used is closed first)
+WORKER_SOURCE_LIMIT = 4
+
+# Give up on the mob address after this many rounds
+MAX_MOB_SCANS = 20
+
+# Evidence (bits) per pair of consecutive rounds that a mob candidate is a live mob
+STEP_EVIDENCE = 3.0     # moved a plausible number of tiles
+TURN_EVIDENCE = 1.0     # face changed
+JUMP_EVIDENCE = -3.0    # moved further than a mob walks in one round
+
+# (dx, dy) of a one tile step in the direction of each face (EO: down, left, up, right)
+FACE_STEPS = ((0, 1), (-1, 0), (0, -1), (1, 0))
+
+# Compiled once at import - new patterns in cindy_config cost nothing per scan
+MOB_PATTERN = cindy_patterns.compile_pattern(cindy_config.MOB_PATTERN, cindy_config.MOB_PATTERN_CAPTURES)
+PLAYER_PATTERN = cindy_patterns.compile_pattern(cindy_config.PLAYER_PATTERN, cindy_config.PLAYER_PATTERN_CAPTURES)
+
+# Patterns by name (names travel to worker processes, compiled patterns don't need to)
+PATTERNS = {
+    'mob': MOB_PATTERN,
+    'player': PLAYER_PATTERN,
+}
+
+
+def match_chunks(chunks, pattern):
+    """Scan (addr, buffer) chunks for pattern, also matching across seams of back to back chunks"""
+    overlap = pattern.length - 1
+    matches = []
+    tail_addr = None
+    tail = b''
+    for addr, buffer in chunks:
+        # Offsets in the last pattern.length - 1 bytes of the previous chunk are checked here with the bytes that follow
+        if tail and tail_addr + len(tail) == addr:
+            seam = tail + bytes(buffer[:overlap])
+            matches.extend(pattern.match_buffer(seam, tail_addr))
+        matches.extend(pattern.match_buffer(buffer, addr))
+        tail = bytes(buffer[-overlap:]) if overlap else b''
+        tail_addr = addr + len(buffer) - len(tail)
+    return matches
+
+
+def merge_chunks(chunks):
+    """Join (addr, buffer) chunks that sit back to back into larger runs"""
+    runs = []
+    run_addr = None
+    run = None
+    for addr, buffer in chunks:
+        if run is not None and run_addr + len(run) == addr:
+            run += buffer
+        else:
+            if run is not None:
+                runs.append((run_addr, run))
+            run_addr = addr
+            run = bytearray(buffer)
+    if run is not None:
+        runs.append((run_addr, run))
+    return runs
+
+
+def match_mob_chunks(chunks):
+    """Scan (addr, buffer) chunks for mob patterns - the mob range is small, so it is matched in one go"""
+    return match_chunks(merge_chunks(chunks), MOB_PATTERN)
+
+
+def plan_read_ranges(addresses, span, max_gap=READ_MERGE_GAP):
+    """Merge candidate addresses into as few (start, size) reads as possible, each covering span bytes per address"""
+    ranges = []
+    start = end = None
+    for addr in sorted(set(addresses)):
+        if start is not None and addr - end <= max_gap:
+            end = max(end, addr + span)
+        else:
+            if start is not None:
+                ranges.append((start, end - start))
+            start = addr
+            end = addr + span
+    if start is not None:
+        ranges.append((start, end - start))
+    return ranges
+
+
+def rescan_candidates(source, addresses, pattern):
+    """Re-read only the candidate addresses and return the matches that are still candidates
+
+    Unreadable candidates and candidates that no longer match are dropped.
+    """
+    wanted = set(addresses)
+    matches = []
+    for start, size in plan_read_ranges(wanted, pattern.length):
+        try:
+            buffer = source.read_bytes(start, size)
+        except Exception:
+            continue
+        for match in pattern.match_buffer(buffer, start):
+            if match[0] in wanted:
+                matches.append(match)
+    return matches
+
+
+def read_chunks(source, start_addr, end_addr, chunk_size=SCAN_CHUNK_SIZE):
+    """Yield (addr, buffer) for every readable chunk of [start_addr, end_addr)"""
+    current_addr = start_addr
+
+    while current_addr < end_addr:
+        size = min(chunk_size, end_addr - current_addr)
+
+        # Read straight into the buffer that gets yielded, big spans aren't copied twice
+        buffer = bytearray(size)
+        try:
+            count = source.read_into(current_addr, buffer)
+        except Exception:
+            count = 0
+        if count:
+            del buffer[count:]
+            yield current_addr, buffer
+
+        current_addr += size
+
+
+def scan_spans(source, start_addr, end_addr):
+    """Readable (start, end) spans of [start_addr, end_addr) from the cached region map, or None"""
+    spans = cindy_memory.region_map(source)
+    if spans is None:
+        return None
+    return cindy_memory.clip_spans(spans, start_addr, end_addr)
+
+
+def read_ranges(source, start_addr, end_addr, fallback_size=SCAN_CHUNK_SIZE):
+    """Yield (addr, buffer) for [start_addr, end_addr) - one read per readable span
+
+    Unreadable pages are never requested. Sources without a region map are
+    read blind in fallback_size chunks instead.
+    """
+    spans = scan_spans(source, start_addr, end_addr)
+    if spans is None:
+        yield from read_chunks(source, start_addr, end_addr, fallback_size)
+        return
+    for span_start, span_end in spans:
+        yield from read_chunks(source, span_start, span_end, MAX_READ_SIZE)
+
+
+# ==================================================
+# PARALLEL RANGE SCANNING
+# ==================================================
+
+# Memory sources opened inside a worker process: spec -> (generation, source), least recently used first
+_worker_sources = {}
+
+
+def _worker_source(spec, generation):
+    """Open (once per worker process and source generation) the source described by spec
+
+    A new generation under the same spec (a restarted client that got its old
+    PID back) closes the old handle instead of reading the new process through
+    it. At most WORKER_SOURCE_LIMIT sources stay open, so handles of exited
+    clients don't pile up in long-lived workers.
+    """
+    entry = _worker_sources.pop(spec, None)
+    if entry is not None and entry[0] != generation:
+        entry[1].close()
+        entry = None
+    if entry is None:
+        while len(_worker_sources) >= WORKER_SOURCE_LIMIT:
+            _worker_sources.pop(next(iter(_worker_sources)))[1].close()
+        entry = (generation, cindy_memory.open_source_spec(spec))
+    _worker_sources[spec] = entry
+    return entry[1]
+
+
+def scan_shard(spec, generation, shard_start, shard_end, read_end, pattern, read_size):
+    """Worker entry point - scan [shard_start, read_end) and keep matches that start before shard_end"""
+    source = _worker_source(spec, generation)
+    matches = match_chunks(read_chunks(source, shard_start, read_end, read_size), PATTERNS[pattern])
+    return [match for match in matches if match[0] < shard_end]
+
+
+def plan_shards(spans, shard_count, overlap, min_size=SCAN_CHUNK_SIZE):
+    """Split (start, end) spans into (shard_start, shard_end, read_end) shards
+
+    Shards never cross a span, so each one is a single read of known readable memory.
+    Each shard reads overlap (pattern length - 1) bytes into the next one of the same
+    span so patterns sitting on a shard boundary are still seen by exactly one shard.
+    """
+    total = sum(end - start for start, end in spans)
+    if total <= 0:
+        return []
+    shard_size = max(min_size, -(-total // max(1, shard_count)))
+
+    shards = []
+    for span_start, span_end in spans:
+        shard_start = span_start
+        while shard_start < span_end:
+            shard_end = min(shard_start + shard_size, span_end)
+            read_end = min(shard_end + overlap, span_end)
+            shards.append((shard_start, shard_end, read_end))
+            shard_start = shard_end
+    return shards
+
+
+class ParallelScanner:
+    """Runs range scans on a process pool - one shard per task, each worker with its own memory source"""
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = None
+
+    def scan(self, source, start_addr, end_addr, pattern):
+        """Scan [start_addr, end_addr) for pattern ('mob' or 'player'), matches come back in address order"""
+        spans = scan_spans(source, start_addr, end_addr)
+        if spans is None:
+            # No region map - blind chunked reads, failed chunks are skipped
+            spans = [(start_addr, end_addr)]
+            read_size = SCAN_CHUNK_SIZE
+        else:
+            read_size = MAX_READ_SIZE
+
+        # A few shards per worker keeps every core busy when spans differ in size
+        shards = plan_shards(spans, self.workers * 4, PATTERNS[pattern].length - 1)
+        if self.workers == 1 or len(shards) <= 1:
+            return match_chunks(read_ranges(source, start_addr, end_addr), PATTERNS[pattern])
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        spec = source.spec()
+        generation = source.generation()
+        futures = [
+            self.executor.submit(scan_shard, spec, generation, shard_start, shard_end, read_end, pattern, read_size)
+            for shard_start, shard_end, read_end in shards
+        ]
+
+        # Shards are disjoint and in order, so concatenating keeps address order
+        matches = []
+        for future in futures:
+            matches.extend(future.result())
+        return matches
+
+    def shutdown(self):
+        """Stop the worker processes (their open sources go with them)"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+# ==================================================
+# MOB ADDRESS ROUNDS
+# ==================================================
+
+def live_rounds(source, delay, max_rounds=MAX_MOB_SCANS):
+    """Yield the same live source once per scan round, sleeping delay seconds before each later round"""
+    for round_number in range(max_rounds):
+        if round_number:
+            time.sleep(delay)
+        yield source
+
+
+def scan_mob_range(source, start_addr, end_addr, scan_number):
+    """Full sweep of the mob range (default full_scan for find_mob_address)"""
+    return match_mob_chunks(read_ranges(source, start_addr, end_addr, MOB_CHUNK_SIZE))
+
+
+def score_mob_candidate(scans, max_step=cindy_config.MOB_MAX_STEP):
+    """Evidence (bits) that a candidate's scans are a live mob record
+
+    Every pair of consecutive scans adds STEP_EVIDENCE for a walk of 1..max_step
+    tiles, TURN_EVIDENCE for a new face and JUMP_EVIDENCE for a longer move. A
+    face outside 0-3 rules the candidate out.
+    """
+    score = 0.0
+    previous = None
+    for _, _, values in scans:
+        face, y, x = values['first_byte'], values['fifth_byte'], values['ninth_byte']
+        if face > 3:
+            return float('-inf')
+        if previous is not None:
+            old_face, old_y, old_x = previous
+            step = abs(x - old_x) + abs(y - old_y)
+            if step > max_step:
+                score += JUMP_EVIDENCE
+            elif step:
+                score += STEP_EVIDENCE
+            if face != old_face:
+                score += TURN_EVIDENCE
+        previous = (face, y, x)
+    return score
+
+
+def motion_sample(scan):
+    """(face, y, x) of one address_scans entry"""
+    values = scan[2]
+    return values['first_byte'], values['fifth_byte'], values['ninth_byte']
+
+
+def implausible_moves(previous, current, max_step=cindy_config.MOB_MAX_STEP):
+    """Per candidate, True if no mob could get from its previous (face, y, x) sample to the current one
+
+    Out: a face outside 0-3, a move of more than max_step tiles, or a move of
+    exactly one tile that the face doesn't point along. Runs over every
+    candidate at once with numpy.
+    """
+    if NUMPY_AVAILABLE:
+        previous = np.asarray(previous, dtype=np.int32).reshape(-1, 3)
+        current = np.asarray(current, dtype=np.int32).reshape(-1, 3)
+        face = current[:, 0]
+        dy = current[:, 1] - previous[:, 1]
+        dx = current[:, 2] - previous[:, 2]
+        step = np.abs(dx) + np.abs(dy)
+        facing = np.array(FACE_STEPS, dtype=np.int32)[np.clip(face, 0, 3)]
+        wrong_way = (step == 1) & ((facing[:, 0] != dx) | (facing[:, 1] != dy))
+        return ((face < 0) | (face > 3) | (step > max_step) | wrong_way).tolist()
+
+    result = []
+    for (_, old_y, old_x), (face, y, x) in zip(previous, current):
+        dx, dy = x - old_x, y - old_y
+        step = abs(dx) + abs(dy)
+        result.append(not 0 <= face <= 3 or step > max_step or (step == 1 and FACE_STEPS[face] != (dx, dy)))
+    return result
+
+
+def mob_confidence(score):
+    """0..1 from a score in bits (3 bits = 0.875, 4 bits = 0.94)"""
+    return 1.0 - 2.0 ** -score if score > 0 else 0.0
+
+
+def find_mob_address(rounds, start_addr, end_addr, full_scan=scan_mob_range, pattern=MOB_PATTERN,
+                     min_scans=cindy_config.MIN_SCANS_REQUIRED,
+                     threshold=cindy_config.MOB_CONFIDENCE_THRESHOLD,
+                     doubt=cindy_config.MOB_DOUBT_CONFIDENCE,
+                     max_scans=MAX_MOB_SCANS, motion_filter=cindy_config.MOB_MOTION_FILTER, log=None):
+    """Run mob scan rounds until an address shows movement
+
+    rounds yields one memory source per round: live_rounds() for a running client,
+    or a SnapshotSequence to replay captured frames offline. The first round (and
+    any round after all candidates dropped out) is a full sweep, later rounds only
+    re-read the survivors. Returns (valid_addresses, address_scans).
+
+    Each surviving candidate gets a confidence from score_mob_candidate(). The
+    scan stops as soon as one candidate reaches threshold while every other one
+    is either confident too (more rows of the mob table) or below doubt. From
+    round min_scans on, any confident candidate ends it.
+
+    With motion_filter, candidates that make a move no mob can make between
+    two rounds (see implausible_moves) are dropped for the rest of the scan.
+    """
+    address_scans = defaultdict(list)
+    valid_addresses = []
+
+    # Survivors of the last round - later rounds only re-read these
+    candidates = None
+    # Failed the motion filter - never a candidate again, not even after a full sweep
+    rejected = set()
+
+    for scan_count, source in enumerate(rounds, start=1):
+        if scan_count > max_scans:
+            break
+
+        if candidates:
+            scan_results = rescan_candidates(source, candidates, pattern)
+        else:
+            scan_results = full_scan(source, start_addr, end_addr, scan_count)
+
+        if log:
+            mode = f"narrowed from {len(candidates)}" if candidates else "full sweep"
+            log(f"Mob scan {scan_count} ({mode}): {len(scan_results)} matches")
+        scan_results = [match for match in scan_results if match[0] not in rejected]
+        candidates = [addr for addr, _, _ in scan_results]
+
+        for addr, scan_pattern, dynamic_values in scan_results:
+            address_scans[addr].append((scan_count, scan_pattern, dynamic_values))
+
+        if motion_filter and scan_count > 1:
+            # Candidates seen last round too - one sample pair each
+            paired = [addr for addr in candidates
+                      if len(address_scans[addr]) > 1 and address_scans[addr][-2][0] == scan_count - 1]
+            if paired:
+                implausible = implausible_moves([motion_sample(address_scans[addr][-2]) for addr in paired],
+                                                [motion_sample(address_scans[addr][-1]) for addr in paired])
+                dropped = {addr for addr, bad in zip(paired, implausible) if bad}
+                if dropped:
+                    rejected |= dropped
+                    candidates = [addr for addr in candidates if addr not in dropped]
+                    scan_results = [match for match in scan_results if match[0] not in dropped]
+                    if log:
+                        log(f"Mob scan {scan_count}: {len(dropped)} candidate(s) moved implausibly, dropped")
+
+        if not scan_results or scan_count < 2:
+            continue
+
+        confidence = {addr: mob_confidence(score_mob_candidate(address_scans[addr])) for addr in candidates}
+        accepted = [addr for addr in candidates if confidence[addr] >= threshold]
+        if not accepted:
+            continue
+        runner_up = max((value for value in confidence.values() if value < threshold), default=0.0)
+        if runner_up < doubt or scan_count >= min_scans:
+            if log:
+                log(f"Mob scan {scan_count}: {len(accepted)} confident, best {max(confidence.values()):.2f}, "
+                    f"runner-up {runner_up:.2f}")
+            valid_addresses = sorted(accepted)
+            break
+
+    return valid_addresses, address_scans
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Cindy Scheduler - Change-driven polling for the bot loop
+Polls fast while sampled values are changing and backs off while nothing moves,
+between POLL_MIN_INTERVAL and POLL_MAX_INTERVAL. Failed ticks back off
+exponentially with jitter instead of a flat half-second. Every tick's read
+time, processing time and scheduling lag go into scheduler.stats (cindy_stats).
+
+  scheduler = PollScheduler()
+  while running:
+      scheduler.start_tick()
+      try:
+          sample = read()
+          scheduler.read_done()
+          process(sample)
+          delay = scheduler.tick_done(sample)   # sample: anything comparable with ==
+      except Exception:
+          delay = scheduler.tick_failed()
+      time.sleep(delay)
+"""
+
+import time
+import random
+
+import cindy_config
+from cindy_stats import TickStats
+
+
+class PollScheduler:
+    """Picks the delay before the next tick from whether the last sample changed"""
+
+    def __init__(self,
+                 min_interval=cindy_config.POLL_MIN_INTERVAL,
+                 max_interval=cindy_config.POLL_MAX_INTERVAL,
+                 idle_backoff=cindy_config.POLL_IDLE_BACKOFF,
+                 error_base=cindy_config.ERROR_BACKOFF_BASE,
+                 error_max=cindy_config.ERROR_BACKOFF_MAX):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_backoff = idle_backoff
+        self.error_base = error_base
+        self.error_max = error_max
+
+        self.interval = min_interval
+        self.last_sample = None
+        self.tick_start = None
+        self.tick_read_done = None
+        self.tick_lag = None
+        # When the next tick should start (perf_counter)
+        self.due = None
+        self.consecutive_errors = 0
+
+        self.stats = TickStats()
+
+    def start_tick(self):
+        """Mark the start of a tick"""
+        self.tick_start = time.perf_counter()
+        self.tick_read_done = None
+        self.tick_lag = None if self.due is None else max(0.0, self.tick_start - self.due)
+
+    def read_done(self):
+        """Mark the end of the tick's reads - the rest of the tick counts as processing"""
+        self.tick_read_done = time.perf_counter()
+
+    def finish_tick(self):
+        """Record the current tick's timings, returns its latency"""
+        end = time.perf_counter()
+        read_end = self.tick_read_done if self.tick_read_done is not None else end
+        self.stats.record(read_end - self.tick_start, end - read_end, self.tick_lag)
+        return end - self.tick_start
+
+    def tick_done(self, sample):
+        """Successful tick - returns seconds to sleep before the next one"""
+        latency = self.finish_tick()
+        self.consecutive_errors = 0
+
+        if sample != self.last_sample:
+            # Something moved - poll at full speed
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.idle_backoff)
+        self.last_sample = sample
+
+        # The interval is tick to tick, so the tick's own work counts against it
+        delay = max(0.0, self.interval - latency)
+        self.due = time.perf_counter() + delay
+        return delay
+
+    def tick_failed(self):
+        """Failed tick - returns the backoff delay (exponential, with jitter)"""
+        self.finish_tick()
+        self.stats.record_error()
+        self.consecutive_errors += 1
+
+        delay = min(self.error_max, self.error_base * 2 ** (self.consecutive_errors - 1))
+        # Equal jitter: never less than half the delay, never in lockstep
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        self.due = time.perf_counter() + delay
+        return delay
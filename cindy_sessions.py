@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+Cindy Sessions - Poll several endless.exe clients from one thread
+Every client gets a ClientSession: its own AddressBook, memory handle, ReadPlan
+(2 coalesced reads per tick) and MemoryPoller with its own event bus. The
+SessionManager polls all of them back to back on one PollScheduler, so 10+
+clients cost one thread and a few microseconds of reads each per tick.
+
+  manager = SessionManager()
+  manager.add_all()                     # every running endless.exe
+  while running:
+      results, delay = manager.tick()
+      for result in results:            # PollResult(pid, fields, records, error)
+          ...
+      time.sleep(delay)
+
+Addresses move between clients, so each session resolves its own from the saved
+pointer chains (see cindy_pointers). The address files hold the addresses of the
+client the scan ran on, so they're never used for another one - an address no
+chain resolves stays None until that client is scanned.
+
+Run this file to watch every client's position: python cindy_sessions.py
+"""
+
+import os
+import time
+from collections import namedtuple
+
+import cindy_config
+import cindy_memory
+import cindy_pointers
+import cindy_scanner
+import cindy_mobs
+import cindy_events
+import cindy_scheduler
+import cindy_processes
+import cindycore
+
+# One client's sample for one tick - error is the exception if the read failed
+PollResult = namedtuple('PollResult', ['pid', 'fields', 'records', 'error'])
+
+# Address file -> pattern its address has to match
+ADDRESS_FILES = (
+    ('mob_base', cindy_config.MOB_ADDRESS_FILE, cindy_scanner.MOB_PATTERN),
+    ('char_x', cindy_config.PLAYER_ADDRESS_FILE, cindy_scanner.PLAYER_PATTERN),
+)
+
+
+def resolve_address_book(source, directory=None):
+    """AddressBook for the client behind source from the saved pointer chains (None where no chain resolves)"""
+    directory = directory or os.path.dirname(os.path.abspath(__file__))
+    addresses = {}
+    for name, filename, pattern in ADDRESS_FILES:
+        path = os.path.join(directory, filename)
+        try:
+            addr = cindy_pointers.follow_saved_chains(source, path, pattern)
+        except Exception:
+            addr = None
+        if addr is None:
+            # The address file belongs to the client the scan ran on - another client's would read garbage
+            print(f"Warning: No saved pointer chain for {filename} resolves in this client, {name} needs a rescan")
+        addresses[name] = addr
+    return cindycore.AddressBook(**addresses)
+
+
+class ClientSession:
+    """One client: address book, memory handle, read plan and poller"""
+
+    def __init__(self, pid, source, address_book, mob_table=None, bus=None):
+        self.pid = pid
+        self.source = source
+        self.address_book = address_book
+        self.mob_table = mob_table
+        # Rebuild the mob table when the mob address changes
+        self.discover_mobs = mob_table is not None
+        self.bus = bus if bus is not None else cindy_events.EventBus()
+        self.build()
+
+        self.errors = 0
+        self.consecutive_errors = 0
+
+    def build(self):
+        """Read plan and poller for the address book's current addresses"""
+        # Version before state: a reload in between only means one more rebuild
+        self.address_book.state()
+        self.book_version = self.address_book.version
+        self.mob_base, _, fields = self.address_book.state()
+        if self.mob_table is not None:
+            # The table read covers the mob fields
+            fields = {name: addr for name, addr in fields.items() if name in cindycore.PLAYER_FIELD_OFFSETS}
+        self.read_plan = cindy_memory.ReadPlan(fields)
+        # A new poller announces the new state in full on its first poll
+        self.poller = cindy_events.MemoryPoller(self.read_plan, self.mob_table, self.bus)
+
+    def refresh_addresses(self):
+        """Between ticks: switch to new addresses if the book has them, returns True if it did"""
+        # Compare versions - another thread may have reloaded the book already
+        self.address_book.refresh()
+        if self.address_book.version == self.book_version:
+            return False
+        mob_base = self.address_book.mob_base
+        if self.discover_mobs and mob_base != self.mob_base:
+            self.mob_table = cindy_mobs.discover_table(self.source, mob_base) if mob_base is not None else None
+        self.build()
+        return True
+
+    def poll(self):
+        """Read this tick's sample, returns a PollResult"""
+        try:
+            fields, records = self.poller.poll(self.source)
+        except Exception as e:
+            self.errors += 1
+            self.consecutive_errors += 1
+            return PollResult(self.pid, None, None, e)
+        self.consecutive_errors = 0
+        return PollResult(self.pid, fields, records, None)
+
+    def close(self):
+        self.source.close()
+
+
+def open_session(pid, address_book=None, discover_mobs=True):
+    """Attach to pid and build its session (the mob table is discovered with one mob range scan)"""
+    source = cindy_processes.open_shared(pid)
+    try:
+        if address_book is None:
+            address_book = resolve_address_book(source)
+        mob_table = None
+        if discover_mobs and cindy_mobs.NUMPY_AVAILABLE and address_book.mob_base is not None:
+            mob_table = cindy_mobs.discover_table(source, address_book.mob_base)
+        return ClientSession(pid, source, address_book, mob_table)
+    except Exception:
+        source.close()
+        raise
+
+
+class SessionManager:
+    """Every attached client, polled from one thread on one scheduler"""
+
+    def __init__(self, scheduler=None, watcher=None):
+        self.sessions = {}
+        self.scheduler = scheduler or cindy_scheduler.PollScheduler()
+        # Client exits drop their session before the next tick tries to read it
+        self.watcher = watcher or cindy_processes.get_watcher()
+        self.exits = self.watcher.bus.subscribe(kinds=(cindy_processes.ProcessExited,))
+
+    def add(self, pid, address_book=None, discover_mobs=True):
+        """Attach to pid (no-op if it's already attached), returns its session"""
+        if pid not in self.sessions:
+            self.sessions[pid] = open_session(pid, address_book, discover_mobs)
+        return self.sessions[pid]
+
+    def add_session(self, session):
+        """Add an already built session (replaces one with the same pid)"""
+        self.remove(session.pid)
+        self.sessions[session.pid] = session
+        return session
+
+    def add_all(self, discover_mobs=True):
+        """Attach to every running endless.exe, returns the pids that couldn't be attached"""
+        failed = []
+        for pid in cindycore.find_endless_pids():
+            try:
+                self.add(pid, discover_mobs=discover_mobs)
+            except Exception as e:
+                print(f"Warning: Could not attach to PID {pid}: {e}")
+                failed.append(pid)
+        return failed
+
+    def remove(self, pid):
+        session = self.sessions.pop(pid, None)
+        if session is not None:
+            session.close()
+
+    def close(self):
+        for pid in list(self.sessions):
+            self.remove(pid)
+        self.watcher.bus.unsubscribe(self.exits)
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __contains__(self, pid):
+        return pid in self.sessions
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def poll(self):
+        """One sample from every client, [PollResult, ...] - clients whose process exited are dropped"""
+        for event in self.exits.drain():
+            if event.pid in self.sessions:
+                print(f"PID {event.pid} exited")
+                self.remove(event.pid)
+
+        results = []
+        for session in list(self.sessions.values()):
+            result = session.poll()
+            if result.error is not None and not self.watcher.is_running(session.pid):
+                self.remove(session.pid)
+            results.append(result)
+        return results
+
+    def tick(self):
+        """Poll every client once, returns (results, seconds to sleep before the next tick)"""
+        for session in self.sessions.values():
+            try:
+                session.refresh_addresses()
+            except Exception as e:
+                print(f"Warning: Could not reload addresses for PID {session.pid}: {e}")
+        self.scheduler.start_tick()
+        results = self.poll()
+        self.scheduler.read_done()
+        if results and all(result.error is not None for result in results):
+            return results, self.scheduler.tick_failed()
+        # Any client changing keeps polling fast
+        versions = tuple(session.poller.version for session in self.sessions.values())
+        return results, self.scheduler.tick_done(versions)
+
+
+def watch():
+    """Attach to every client and print position changes per PID until Ctrl+C"""
+    with SessionManager() as manager:
+        manager.add_all()
+        if not manager:
+            print("No 'endless.exe' found.")
+            return
+        for pid, session in manager.sessions.items():
+            print(f"PID {pid}: {session.address_book}, {len(session.read_plan)} read(s) + "
+                  f"{'mob table' if session.mob_table is not None else 'no mob table'}")
+
+        last = {}
+        try:
+            while manager:
+                results, delay = manager.tick()
+                for result in results:
+                    if result.error is not None:
+                        continue
+                    position = (result.fields.get('char_x'), result.fields.get('char_y'))
+                    if last.get(result.pid) != position:
+                        last[result.pid] = position
+                        print(f"[{result.pid}] player at {position}")
+                time.sleep(delay)
+        except KeyboardInterrupt:
+            pass
+        stats = manager.scheduler.stats
+        print(f"{stats.ticks} ticks, {stats.errors} failed, read {stats.format_line('read')}")
+
+
+if __name__ == "__main__":
+    watch()
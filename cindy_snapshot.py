@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+"""
+Cindy Snapshot - Captured process memory for offline scanning and benchmarks
+Capture the mob/player ranges of a live client once, replay scans against them forever.
+
+File format (little-endian):
+  file header   : magic 'CINDYSNP', version u16, reserved u16, region count u32, captured_at f64
+  region table  : per region - base u64, size u64, data offset u64, protection u32, reserved u32, captured_at f64
+  region data   : raw bytes of each region, every region starts on a 4 KB page boundary
+
+Because the data is page aligned the reader mmaps the file once and hands out
+slices of it - nothing is copied or loaded up front.
+
+Usage:
+  python cindy_snapshot.py capture --out mobs.snap --ranges mob
+  python cindy_snapshot.py capture --out mobs.snap --ranges mob --count 6 --delay 1.0
+  python cindy_snapshot.py info mobs_000.snap
+"""
+
+import os
+import sys
+import glob
+import mmap
+import time
+import bisect
+import struct
+import argparse
+
+import cindy_config
+import cindy_memory
+from cindy_memory import MemorySource, MemoryRegion, MemoryReadError
+
+SNAPSHOT_MAGIC = b'CINDYSNP'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_EXTENSION = '.snap'
+PAGE_SIZE = 4096
+
+FILE_HEADER = struct.Struct('<8sHHId')
+REGION_ENTRY = struct.Struct('<QQQIId')
+
+# Read size while capturing (a failed chunk splits the region instead of losing all of it)
+CAPTURE_CHUNK_SIZE = 1024 * 1024
+
+# Named ranges for the capture command
+CAPTURE_RANGES = {
+    'mob': (cindy_config.MOB_MEMORY_START, cindy_config.MOB_MEMORY_END),
+    'player': (cindy_config.PLAYER_MEMORY_START, cindy_config.PLAYER_MEMORY_END),
+}
+
+# Windows page protection values, also used for /proc/<pid>/maps permission strings
+PAGE_READONLY = 0x02
+PAGE_READWRITE = 0x04
+PAGE_EXECUTE_READ = 0x20
+PAGE_EXECUTE_READWRITE = 0x40
+
+
+def protection_to_int(protection):
+    """Store protection as a Windows PAGE_* value, converting 'rwxp' strings from /proc"""
+    if isinstance(protection, int):
+        return protection
+    writable = 'w' in protection
+    if 'x' in protection:
+        return PAGE_EXECUTE_READWRITE if writable else PAGE_EXECUTE_READ
+    return PAGE_READWRITE if writable else PAGE_READONLY
+
+
+def align_page(offset):
+    """Round offset up to the next page boundary"""
+    return -(-offset // PAGE_SIZE) * PAGE_SIZE
+
+
+class SnapshotMemorySource(MemorySource):
+    """Memory source backed by a snapshot file - reads are slices of one mmap"""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.file = open(path, 'rb')
+        # A snapshot rewritten under the same path is a different source (region maps, scan workers)
+        stat = os.fstat(self.file.fileno())
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+
+        magic, version, _, region_count, self.captured_at = FILE_HEADER.unpack_from(self.map, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a Cindy snapshot")
+        if version != SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(f"{path} has unsupported snapshot version {version}")
+
+        # Region table, sorted by base so lookups can bisect
+        self.region_table = []
+        for i in range(region_count):
+            base, size, data_offset, protection, _, captured_at = REGION_ENTRY.unpack_from(
+                self.map, FILE_HEADER.size + i * REGION_ENTRY.size
+            )
+            self.region_table.append({
+                'base': base,
+                'size': size,
+                'data_offset': data_offset,
+                'protection': protection,
+                'captured_at': captured_at,
+            })
+        self.region_table.sort(key=lambda region: region['base'])
+        self.region_bases = [region['base'] for region in self.region_table]
+
+    def find_region(self, addr):
+        """Region entry containing addr, or None"""
+        i = bisect.bisect_right(self.region_bases, addr) - 1
+        if i >= 0:
+            region = self.region_table[i]
+            if addr < region['base'] + region['size']:
+                return region
+        return None
+
+    def read_view(self, addr, size):
+        """Zero-copy view of size bytes at addr (must sit inside one region)
+
+        The view keeps the mapping alive - after close() the file stays mapped
+        until the last view handed out is released or garbage collected.
+        """
+        region = self.find_region(addr)
+        if region is None or addr + size > region['base'] + region['size']:
+            raise MemoryReadError(f"0x{addr:08X} ({size} bytes) is outside snapshot {self.path}")
+        start = region['data_offset'] + addr - region['base']
+        return self.view[start:start + size]
+
+    def read_into(self, addr, buffer):
+        target = memoryview(buffer).cast('B')
+        count = 0
+
+        # Keep copying while the next byte is covered by a region (back to back regions read as one)
+        while count < len(target):
+            region = self.find_region(addr + count)
+            if region is None:
+                break
+            start = addr + count - region['base']
+            size = min(len(target) - count, region['size'] - start)
+            offset = region['data_offset'] + start
+            target[count:count + size] = self.view[offset:offset + size]
+            count += size
+
+        if count == 0:
+            raise MemoryReadError(f"0x{addr:08X} is outside snapshot {self.path}")
+        return count
+
+    def regions(self):
+        return [
+            MemoryRegion(region['base'], region['size'], region['protection'])
+            for region in self.region_table
+        ]
+
+    def spec(self):
+        return (type(self), (self.path,))
+
+    def cache_key(self):
+        return (type(self), self.path, self.mtime_ns, self.size)
+
+    def generation(self):
+        return (self.mtime_ns, self.size)
+
+    def close(self):
+        if self.map is not None:
+            self.view.release()
+            try:
+                self.map.close()
+            except BufferError:
+                # read_view() slices still alive - the mmap is unmapped once the last one goes
+                pass
+            self.file.close()
+            self.map = None
+
+
+def readable_spans(source, ranges):
+    """Intersect the requested (start, end) ranges with the source's readable regions"""
+    spans = []
+    for region in source.regions():
+        region_end = region.base + region.size
+        for start, end in ranges:
+            span_start = max(start, region.base)
+            span_end = min(end, region_end)
+            if span_start < span_end:
+                spans.append((span_start, span_end, region.protection))
+    spans.sort()
+    return spans
+
+
+def capture_regions(source, ranges):
+    """Read the requested ranges, returns [(base, data, protection, captured_at)]
+
+    A chunk that fails to read ends the current region, so one bad page only
+    loses that chunk instead of the whole range.
+    """
+    captured = []
+    for span_start, span_end, protection in readable_spans(source, ranges):
+        region_base = span_start
+        data = bytearray()
+        captured_at = time.time()
+        addr = span_start
+
+        while addr < span_end:
+            size = min(CAPTURE_CHUNK_SIZE, span_end - addr)
+            chunk = bytearray(size)
+            try:
+                count = source.read_into(addr, chunk)
+            except MemoryReadError:
+                count = 0
+
+            if count:
+                data += chunk[:count]
+            if count < size:
+                if data:
+                    captured.append((region_base, data, protection, captured_at))
+                # Skip the unreadable rest of this chunk
+                addr += size
+                region_base = addr
+                data = bytearray()
+                captured_at = time.time()
+                continue
+            addr += size
+
+        if data:
+            captured.append((region_base, data, protection, captured_at))
+    return captured
+
+
+def write_snapshot(path, regions, captured_at=None):
+    """Write [(base, data, protection, captured_at)] regions to a snapshot file"""
+    if captured_at is None:
+        captured_at = time.time()
+
+    data_offset = align_page(FILE_HEADER.size + len(regions) * REGION_ENTRY.size)
+    entries = []
+    for base, data, protection, region_time in regions:
+        entries.append(REGION_ENTRY.pack(base, len(data), data_offset, protection_to_int(protection), 0, region_time))
+        data_offset = align_page(data_offset + len(data))
+
+    with open(path, 'wb') as f:
+        f.write(FILE_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, len(regions), captured_at))
+        for entry in entries:
+            f.write(entry)
+        for base, data, protection, region_time in regions:
+            f.seek(align_page(f.tell()))
+            f.write(data)
+        # Pad the last region so the file size is page aligned as well
+        f.truncate(align_page(f.tell()))
+
+
+def capture_snapshot(source, ranges, path):
+    """Capture the given (start, end) ranges of a live source into one snapshot file"""
+    captured_at = time.time()
+    regions = capture_regions(source, ranges)
+    write_snapshot(path, regions, captured_at)
+    return regions
+
+
+def sequence_path(prefix, index):
+    """File name of frame index in a snapshot sequence"""
+    return f"{prefix}_{index:03d}{SNAPSHOT_EXTENSION}"
+
+
+def capture_sequence(source, ranges, prefix, count, delay):
+    """Capture count snapshots delay seconds apart, returns the file paths"""
+    paths = []
+    for index in range(count):
+        if index:
+            time.sleep(delay)
+        path = sequence_path(prefix, index)
+        capture_snapshot(source, ranges, path)
+        paths.append(path)
+    return paths
+
+
+class SnapshotSequence:
+    """Ordered snapshot frames of the same ranges - replays the temporal mob checks offline"""
+
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self.frames = [SnapshotMemorySource(path) for path in self.paths]
+
+    @classmethod
+    def from_prefix(cls, prefix):
+        """Load every frame written by capture_sequence(prefix=...)"""
+        paths = sorted(glob.glob(f"{glob.escape(prefix)}_[0-9][0-9][0-9]{SNAPSHOT_EXTENSION}"))
+        if not paths:
+            raise FileNotFoundError(f"No snapshot frames found for {prefix}")
+        return cls(paths)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __iter__(self):
+        return iter(self.frames)
+
+    def __getitem__(self, index):
+        return self.frames[index]
+
+    def close(self):
+        for frame in self.frames:
+            frame.close()
+
+
+def find_endless_pid():
+    """First endless.exe PID, or None"""
+    import cindy_processes
+    return cindy_processes.ProcessWatcher().first()
+
+
+def print_info(path):
+    """Print the region table of a snapshot file"""
+    source = SnapshotMemorySource(path)
+    print(f"{path}: captured {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(source.captured_at))}")
+    for region in source.region_table:
+        print(f"  0x{region['base']:08X} - 0x{region['base'] + region['size']:08X}"
+              f"  {region['size']:>10d} bytes  protect 0x{region['protection']:02X}")
+    source.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture and inspect Cindy memory snapshots")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    capture = commands.add_parser('capture', help='capture snapshots from a live endless.exe')
+    capture.add_argument('--pid', type=int, help='process id (default: first endless.exe)')
+    capture.add_argument('--out', required=True, help='snapshot file (or prefix when --count > 1)')
+    capture.add_argument('--ranges', default='mob,player', help='comma separated: mob, player or 0xSTART-0xEND')
+    capture.add_argument('--count', type=int, default=1, help='number of snapshots in the sequence')
+    capture.add_argument('--delay', type=float, default=cindy_config.DEFAULT_SCAN_DELAY, help='seconds between snapshots')
+
+    info = commands.add_parser('info', help='show the regions in a snapshot')
+    info.add_argument('paths', nargs='+')
+
+    args = parser.parse_args()
+
+    if args.command == 'info':
+        for path in args.paths:
+            print_info(path)
+        return 0
+
+    ranges = []
+    for name in args.ranges.split(','):
+        name = name.strip()
+        if name in CAPTURE_RANGES:
+            ranges.append(CAPTURE_RANGES[name])
+        else:
+            start, end = name.split('-')
+            ranges.append((int(start, 16), int(end, 16)))
+
+    pid = args.pid or find_endless_pid()
+    if pid is None:
+        print("ERROR: endless.exe not found. Please start Endless Online first.")
+        return 1
+
+    with cindy_memory.open_memory_source(pid) as source:
+        if args.count > 1:
+            prefix = args.out[:-len(SNAPSHOT_EXTENSION)] if args.out.endswith(SNAPSHOT_EXTENSION) else args.out
+            paths = capture_sequence(source, ranges, prefix, args.count, args.delay)
+        else:
+            capture_snapshot(source, ranges, args.out)
+            paths = [args.out]
+
+    for path in paths:
+        print(f"Saved {path} ({os.path.getsize(path)} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
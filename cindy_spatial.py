@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Cindy Spatial - Uniform grid over tile coordinates for nearest-mob queries
+Entities live in square cells of SPATIAL_CELL_SIZE tiles. Moving an entity is a
+dict update (and a set swap when it crosses a cell border), queries only look at
+the cells around the query point instead of every entity. Distances are
+Manhattan, same as cindy_utils.calculate_distance.
+
+  grid = SpatialGrid()
+  grid.move(mob_id, x, y)              # insert or update
+  grid.nearest(char_x, char_y, k=3)    # [(distance, mob_id), ...] closest first
+  grid.within(char_x, char_y, 5)       # everything 5 tiles away or closer
+  grid.bulk_nearest(points, k=1)       # many query points at once (numpy)
+
+Run this file for the grid vs linear scan benchmark: python cindy_spatial.py
+"""
+
+import sys
+import time
+import heapq
+import random
+
+import cindy_config
+from cindy_utils import calculate_distance
+
+# Try to import numpy for bulk queries
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class SpatialGrid:
+    """Entities by grid cell, keyed by anything hashable"""
+
+    def __init__(self, cell_size=cindy_config.SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        # (cell_x, cell_y) -> set of keys
+        self.cells = {}
+        # key -> (x, y, cell)
+        self.positions = {}
+        # (keys, xs, ys) for bulk queries, rebuilt after any change
+        self._arrays = None
+
+    def cell_of(self, x, y):
+        return (x // self.cell_size, y // self.cell_size)
+
+    def move(self, key, x, y):
+        """Insert key at (x, y) or move it there"""
+        cell = self.cell_of(x, y)
+        old = self.positions.get(key)
+        if old is not None and old[2] != cell:
+            self._discard(key, old[2])
+        if old is None or old[2] != cell:
+            self.cells.setdefault(cell, set()).add(key)
+        self.positions[key] = (x, y, cell)
+        self._arrays = None
+
+    def remove(self, key):
+        """Forget key (no-op if it isn't in the grid)"""
+        old = self.positions.pop(key, None)
+        if old is not None:
+            self._discard(key, old[2])
+            self._arrays = None
+
+    def _discard(self, key, cell):
+        members = self.cells[cell]
+        members.discard(key)
+        if not members:
+            del self.cells[cell]
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def within(self, x, y, radius):
+        """[(distance, key), ...] for every entity at most radius tiles away, closest first"""
+        cx, cy = self.cell_of(x, y)
+        reach = radius // self.cell_size + 1
+        found = []
+        for gx in range(cx - reach, cx + reach + 1):
+            for gy in range(cy - reach, cy + reach + 1):
+                members = self.cells.get((gx, gy))
+                if not members:
+                    continue
+                for key in members:
+                    ex, ey, _ = self.positions[key]
+                    distance = abs(ex - x) + abs(ey - y)
+                    if distance <= radius:
+                        found.append((distance, key))
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def nearest(self, x, y, k=1):
+        """[(distance, key), ...] for the k closest entities, closest first
+
+        Searches square rings of cells outwards from the query cell. Everything in
+        ring r is at least (r - 1) * cell_size tiles away, so once the k-th best
+        distance is below that no further ring can improve the result.
+        """
+        if k <= 0 or not self.positions:
+            return []
+        cx, cy = self.cell_of(x, y)
+        best = []  # max-heap of (-distance, tiebreak, key)
+        seen = 0
+        ring = 0
+        while seen < len(self.positions):
+            if len(best) == k and -best[0][0] < (ring - 1) * self.cell_size:
+                break
+            for cell in self._ring(cx, cy, ring):
+                members = self.cells.get(cell)
+                if not members:
+                    continue
+                for key in members:
+                    seen += 1
+                    ex, ey, _ = self.positions[key]
+                    distance = abs(ex - x) + abs(ey - y)
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, seen, key))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, seen, key))
+            ring += 1
+        return [(-neg, key) for neg, _, key in sorted(best, reverse=True)]
+
+    @staticmethod
+    def _ring(cx, cy, ring):
+        """Cells at Chebyshev distance ring from (cx, cy)"""
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for gx in range(cx - ring, cx + ring + 1):
+            yield (gx, cy - ring)
+            yield (gx, cy + ring)
+        for gy in range(cy - ring + 1, cy + ring):
+            yield (cx - ring, gy)
+            yield (cx + ring, gy)
+
+    def arrays(self):
+        """(keys, xs, ys) of every entity - numpy arrays, cached until the next change"""
+        if self._arrays is None:
+            keys = list(self.positions)
+            xs = np.fromiter((self.positions[key][0] for key in keys), dtype=np.int64, count=len(keys))
+            ys = np.fromiter((self.positions[key][1] for key in keys), dtype=np.int64, count=len(keys))
+            self._arrays = (keys, xs, ys)
+        return self._arrays
+
+    def bulk_nearest(self, points, k=1):
+        """nearest() for many (x, y) query points, one list per point
+
+        With numpy this is one vectorized distance matrix over every entity, which
+        wins when there are many query points. Without numpy it queries the grid
+        point by point.
+        """
+        if not NUMPY_AVAILABLE or not self.positions:
+            return [self.nearest(x, y, k) for x, y in points]
+
+        keys, xs, ys = self.arrays()
+        query = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        distances = manhattan_distances(query[:, 0], query[:, 1], xs, ys)
+        k = min(k, len(keys))
+        closest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        results = []
+        for row, indices in zip(distances, closest):
+            order = indices[np.argsort(row[indices], kind='stable')]
+            results.append([(int(row[i]), keys[i]) for i in order.tolist()])
+        return results
+
+
+def manhattan_distances(qx, qy, xs, ys):
+    """Distance matrix between query points (qx, qy) and entities (xs, ys), shape (queries, entities)"""
+    qx = np.asarray(qx)[:, None]
+    qy = np.asarray(qy)[:, None]
+    return np.abs(xs[None, :] - qx) + np.abs(ys[None, :] - qy)
+
+
+def linear_nearest(entities, x, y, k=1):
+    """Reference: nearest() by calling calculate_distance on every (key, ex, ey)"""
+    return heapq.nsmallest(k, ((calculate_distance(x, y, ex, ey), key) for key, ex, ey in entities),
+                           key=lambda item: item[0])
+
+
+def benchmark(counts=(50, 200, 1000, 5000), queries=2000, map_size=200, seed=1):
+    """Grid vs linear scan for k=1 and k=5 queries, plus a per-tick move of every entity"""
+    rng = random.Random(seed)
+    for count in counts:
+        entities = [(key, rng.randrange(map_size), rng.randrange(map_size)) for key in range(count)]
+        grid = SpatialGrid()
+        for key, x, y in entities:
+            grid.move(key, x, y)
+        points = [(rng.randrange(map_size), rng.randrange(map_size)) for _ in range(queries)]
+
+        for k in (1, 5):
+            started = time.perf_counter()
+            expected = [linear_nearest(entities, x, y, k) for x, y in points]
+            linear = time.perf_counter() - started
+
+            started = time.perf_counter()
+            got = [grid.nearest(x, y, k) for x, y in points]
+            gridded = time.perf_counter() - started
+
+            # Ties can come back in a different order, the distances must agree
+            ok = all([d for d, _ in a] == [d for d, _ in b] for a, b in zip(expected, got))
+            line = (f"{count:5d} mobs k={k}: linear {linear / queries * 1e6:7.1f} us/query, "
+                    f"grid {gridded / queries * 1e6:6.1f} us/query ({linear / gridded:5.1f}x)")
+
+            if NUMPY_AVAILABLE:
+                started = time.perf_counter()
+                bulk = grid.bulk_nearest(points, k)
+                vectorized = time.perf_counter() - started
+                ok = ok and all([d for d, _ in a] == [d for d, _ in b] for a, b in zip(expected, bulk))
+                line += f", bulk {vectorized / queries * 1e6:6.1f} us/query"
+            print(line + ("" if ok else "  MISMATCH"))
+            if not ok:
+                return False
+
+        started = time.perf_counter()
+        for key, x, y in entities:
+            grid.move(key, x + 1, y)
+        moved = time.perf_counter() - started
+        print(f"{count:5d} mobs: moving all of them {moved * 1e3:.2f} ms")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if benchmark() else 1)
@@ -11,6 +11,7 @@ import os
 import pathlib
 import threading
 import time
+import multiprocessing
 
 class CindySplashScreen:
     def __init__(self):
@@ -218,4 +219,5 @@ def main():
     splash.run()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Scanner worker processes in the .exe build
     main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Cindy Stats - Tick latency histograms for the bot loop
+Every tick records three timings into fixed-bucket histograms:
+  read     - memory reads (the poll)
+  process  - everything after the reads (event handling, tracking)
+  lag      - how late the tick started compared to when the scheduler wanted it
+
+Buckets are log-spaced (4 per doubling, 1 us to ~100 s), so recording is a
+bisect and an increment, memory never grows, and percentiles are within one
+bucket (~19%) of the exact value.
+
+  stats = TickStats()
+  stats.record(read, process, lag)
+  stats.summary()['read']['p99']
+  stats.export('cindy_tick_stats.json')
+"""
+
+import json
+import time
+import bisect
+
+# Histogram range and resolution
+HISTOGRAM_MIN = 1e-6
+HISTOGRAM_BUCKETS_PER_DOUBLING = 4
+HISTOGRAM_BUCKETS = 108
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """Counts of durations (seconds) in log-spaced buckets"""
+
+    # Upper bound of every bucket - anything above the last one lands in an overflow bucket
+    BOUNDS = [HISTOGRAM_MIN * 2 ** (i / HISTOGRAM_BUCKETS_PER_DOUBLING) for i in range(HISTOGRAM_BUCKETS)]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (0.0 if empty)"""
+        if not self.count:
+            return 0.0
+        rank = self.count * p / 100
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                # The overflow bucket and the top bucket are better described by the max
+                return min(self.BOUNDS[i], self.max) if i < len(self.BOUNDS) else self.max
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self):
+        """{'p50': .., 'p95': .., 'p99': .., 'mean': .., 'max': .., 'count': ..} in seconds"""
+        result = {f"p{p}": self.percentile(p) for p in PERCENTILES}
+        result.update(mean=self.mean(), max=self.max, count=self.count)
+        return result
+
+    def reset(self):
+        self.__init__()
+
+
+class TickStats:
+    """Read / process / lag histograms plus tick and error counts"""
+
+    METRICS = ('read', 'process', 'lag')
+
+    def __init__(self):
+        self.read = LatencyHistogram()
+        self.process = LatencyHistogram()
+        self.lag = LatencyHistogram()
+        self.ticks = 0
+        self.errors = 0
+        self.started = time.time()
+
+    def record(self, read, process, lag=None):
+        """One tick's timings in seconds (lag is None for the first tick)"""
+        self.ticks += 1
+        self.read.record(read)
+        self.process.record(process)
+        if lag is not None:
+            self.lag.record(lag)
+
+    def record_error(self):
+        self.errors += 1
+
+    def summary(self):
+        result = {'ticks': self.ticks, 'errors': self.errors, 'runtime': time.time() - self.started}
+        for metric in self.METRICS:
+            result[metric] = getattr(self, metric).summary()
+        return result
+
+    def format_line(self, metric):
+        """'p50 0.05 / p95 0.12 / p99 0.40 ms' for the stats panel"""
+        summary = getattr(self, metric).summary()
+        return " / ".join(f"p{p} {summary[f'p{p}'] * 1e3:.2f}" for p in PERCENTILES) + " ms"
+
+    def export(self, path):
+        """Write the summary and the non-empty buckets to path as JSON"""
+        data = self.summary()
+        data['note'] = 'times in seconds, bucket keys are upper bounds'
+        for metric in self.METRICS:
+            histogram = getattr(self, metric)
+            data[metric]['buckets'] = {
+                (f"{histogram.BOUNDS[i]:.9f}" if i < len(histogram.BOUNDS) else 'overflow'): count
+                for i, count in enumerate(histogram.counts) if count
+            }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Cindy Tracker - Per-mob state built from the poller's events
+Mobs are identified by their spawn point: a mob that dies and respawns in the
+same table row (or another one) keeps its tracker id, found with one dict lookup
+on (spawn_x, spawn_y). Spawn groups share a spawn point, so each point keeps a
+list of ids and a row only takes over a mob that isn't in another row right now.
+Each mob keeps a fixed-size ring of recent positions.
+
+Memory stays flat: records use __slots__, position rings are preallocated
+arrays, and at most MAX_TRACKED_MOBS mobs are remembered - the least recently
+seen mob that isn't in the table right now is forgotten first.
+
+  tracker = MobTracker()
+  events = bus.subscribe(kinds=MOB_EVENTS)
+  ...
+  tracker.handle(events.drain())
+  tracker.active()                  # mobs currently in the table
+  tracker.mobs[mob_id].positions()  # oldest first
+  tracker.nearest(char_x, char_y)   # [(distance, TrackedMob)] via cindy_spatial's grid
+"""
+
+import time
+from array import array
+from collections import OrderedDict
+
+import cindy_config
+from cindy_spatial import SpatialGrid
+from cindy_events import MobMoved, MobFaced, SpawnChanged, MobIdChanged, KillFlagFlipped
+
+# Events the tracker uses - subscribe with kinds=MOB_EVENTS
+MOB_EVENTS = (MobMoved, MobFaced, SpawnChanged, MobIdChanged, KillFlagFlipped)
+
+
+class TrackedMob:
+    """One mob - identity, last known state and its recent positions"""
+
+    __slots__ = (
+        'mob_id', 'spawn_x', 'spawn_y', 'spawn_face', 'row',
+        'x', 'y', 'face', 'game_id', 'kill',
+        'first_seen', 'last_seen', 'respawns',
+        'history', 'history_next', 'history_count',
+    )
+
+    def __init__(self, mob_id, spawn_x, spawn_y, spawn_face, row, now, history_length):
+        self.mob_id = mob_id
+        self.spawn_x = spawn_x
+        self.spawn_y = spawn_y
+        self.spawn_face = spawn_face
+        self.row = row
+        self.x = self.y = self.face = self.game_id = self.kill = None
+        self.first_seen = self.last_seen = now
+        self.respawns = 0
+
+        # Ring of (x, y) pairs, allocated once
+        self.history = array('i', bytes(8 * history_length))
+        self.history_next = 0
+        self.history_count = 0
+
+    def add_position(self, x, y):
+        """Append a position to the ring, overwriting the oldest when full"""
+        slot = self.history_next * 2
+        self.history[slot] = x
+        self.history[slot + 1] = y
+        capacity = len(self.history) // 2
+        self.history_next = (self.history_next + 1) % capacity
+        self.history_count = min(self.history_count + 1, capacity)
+
+    def positions(self):
+        """Recent (x, y) positions, oldest first"""
+        capacity = len(self.history) // 2
+        start = (self.history_next - self.history_count) % capacity
+        return [
+            (self.history[(start + i) % capacity * 2], self.history[(start + i) % capacity * 2 + 1])
+            for i in range(self.history_count)
+        ]
+
+    def __repr__(self):
+        return (f"TrackedMob({self.mob_id}, spawn=({self.spawn_x}, {self.spawn_y}), "
+                f"pos=({self.x}, {self.y}), row={self.row}, respawns={self.respawns})")
+
+
+class MobTracker:
+    """Tracks every mob seen in the mob table, keyed by tracker id"""
+
+    def __init__(self, history_length=cindy_config.MOB_HISTORY_LENGTH, max_mobs=cindy_config.MAX_TRACKED_MOBS):
+        self.history_length = history_length
+        self.max_mobs = max_mobs
+
+        # mob_id -> TrackedMob, least recently seen first
+        self.mobs = OrderedDict()
+        # (spawn_x, spawn_y) -> [mob_id, ...] (spawn groups share a point)
+        self.spawn_index = {}
+        # table row -> mob_id of the mob in it right now
+        self.rows = {}
+        self.next_mob_id = 1
+        # Positions of the mobs in the table, for nearest / within queries
+        self.grid = SpatialGrid()
+
+    def handle(self, events):
+        """Apply a batch of poller events (anything but MOB_EVENTS is ignored)"""
+        now = time.monotonic()
+        for event in events:
+            if not isinstance(event, MOB_EVENTS):
+                continue
+            if isinstance(event, SpawnChanged):
+                self.spawned(event.mob, event.spawn_x, event.spawn_y, event.spawn_face, now)
+                continue
+
+            mob = self.mob_in_row(event.mob)
+            if mob is None:
+                continue
+            mob.last_seen = now
+            self.mobs.move_to_end(mob.mob_id)
+
+            if isinstance(event, MobMoved):
+                mob.x = event.x
+                mob.y = event.y
+                mob.add_position(event.x, event.y)
+                self.grid.move(mob.mob_id, event.x, event.y)
+            elif isinstance(event, MobFaced):
+                mob.face = event.face
+            elif isinstance(event, MobIdChanged):
+                mob.game_id = event.mob_id
+            elif isinstance(event, KillFlagFlipped):
+                mob.kill = event.kill
+
+    def spawned(self, row, spawn_x, spawn_y, spawn_face, now):
+        """A row got a (new) spawn point - re-identify the mob by it or start tracking a new one"""
+        group = self.spawn_index.setdefault((spawn_x, spawn_y), [])
+        old_id = self.rows.get(row)
+
+        # The mob already in this row, else one of the group that has left the table (a respawn)
+        if old_id in group:
+            mob_id = old_id
+        else:
+            mob_id = next((candidate for candidate in group if self.mobs[candidate].row is None), None)
+
+        # Whoever was in this row before has left the table
+        if old_id is not None and old_id != mob_id and old_id in self.mobs:
+            self.mobs[old_id].row = None
+            self.grid.remove(old_id)
+
+        if mob_id is not None:
+            mob = self.mobs[mob_id]
+            if mob.row != row:
+                mob.respawns += 1
+        else:
+            mob_id = self.next_mob_id
+            self.next_mob_id += 1
+            mob = TrackedMob(mob_id, spawn_x, spawn_y, spawn_face, row, now, self.history_length)
+            self.mobs[mob_id] = mob
+            group.append(mob_id)
+
+        mob.row = row
+        mob.spawn_face = spawn_face
+        mob.last_seen = now
+        self.rows[row] = mob_id
+        self.mobs.move_to_end(mob_id)
+        self.forget_stale()
+
+    def forget_stale(self):
+        """Drop the least recently seen mobs that aren't in the table until max_mobs are left"""
+        for mob_id in list(self.mobs):
+            if len(self.mobs) <= self.max_mobs:
+                break
+            mob = self.mobs[mob_id]
+            if mob.row is not None:
+                continue
+            del self.mobs[mob_id]
+            group = self.spawn_index[(mob.spawn_x, mob.spawn_y)]
+            group.remove(mob_id)
+            if not group:
+                del self.spawn_index[(mob.spawn_x, mob.spawn_y)]
+
+    def mob_in_row(self, row):
+        """Mob currently in a table row, or None"""
+        mob_id = self.rows.get(row)
+        return None if mob_id is None else self.mobs.get(mob_id)
+
+    def mobs_at_spawn(self, spawn_x, spawn_y):
+        """Every known mob that spawns at (spawn_x, spawn_y) - more than one for a spawn group"""
+        return [self.mobs[mob_id] for mob_id in self.spawn_index.get((spawn_x, spawn_y), ())]
+
+    def mob_at_spawn(self, spawn_x, spawn_y):
+        """Mob that spawns at (spawn_x, spawn_y) - the one in the table if any - or None"""
+        mobs = self.mobs_at_spawn(spawn_x, spawn_y)
+        return next((mob for mob in mobs if mob.row is not None), mobs[0] if mobs else None)
+
+    def active(self):
+        """Mobs in the table right now"""
+        return [self.mobs[mob_id] for mob_id in self.rows.values()]
+
+    def nearest(self, x, y, k=1):
+        """[(distance, TrackedMob), ...] for the k active mobs closest to (x, y)"""
+        return [(distance, self.mobs[mob_id]) for distance, mob_id in self.grid.nearest(x, y, k)]
+
+    def within(self, x, y, radius):
+        """[(distance, TrackedMob), ...] for active mobs at most radius tiles from (x, y)"""
+        return [(distance, self.mobs[mob_id]) for distance, mob_id in self.grid.within(x, y, radius)]
@@ -8,7 +8,18 @@ import random
 import subprocess
 from io import StringIO
 import cindycore as bot_module
-import pymem
+import cindy_scanner
+import cindy_memory
+import cindy_pointers
+import cindy_mobs
+import cindy_scheduler
+import cindy_events
+import cindy_tracker
+import cindy_sessions
+import cindy_replay
+import cindy_addressdb
+import cindy_processes
+import cindy_config
 import psutil
 from collections import defaultdict
 
@@ -152,6 +163,9 @@ class BotUI:
         # Bot state
         self.bot_thread = None
         self.bot_running = False
+        self.poll_scheduler = None
+        self.event_bus = cindy_events.EventBus()
+        self.mob_tracker = None
         self.log_queue = queue.Queue()
         self.original_stdout = sys.stdout
         
@@ -160,6 +174,12 @@ class BotUI:
         self.scan_thread = None
         self.scan_animation_index = 0
         self.scan_animation_timer = None
+        self.parallel_scanner = cindy_scanner.ParallelScanner()
+        self.address_db = cindy_addressdb.AddressDB()
+        
+        # Running clients - cached, with start / exit events
+        self.process_watcher = cindy_processes.get_watcher()
+        self.process_events = self.process_watcher.bus.subscribe(kinds=(cindy_processes.ProcessExited,))
         
         # Process attachment state
         self.process_attached = False
@@ -207,12 +227,26 @@ class BotUI:
         
         self.setup_ui()
         self.update_log()
+        self.check_process_events()
+        
+        # Closing the window also stops the scanner's worker processes
+        self.root.protocol("WM_DELETE_WINDOW", self.close_window)
         
         # Check and validate addresses on startup
-        self.root.after(500, self.validate_existing_addresses)
+        self.root.after(500, self.start_address_validation)
         
+    def close_window(self):
+        """Stop the bot and the scanner worker processes, then close the window"""
+        self.bot_running = False
+        self.parallel_scanner.shutdown()
+        self.root.destroy()
+    
+    def start_address_validation(self):
+        """Validate the saved addresses on a worker thread - hashing the exe and following chains takes a while"""
+        threading.Thread(target=self.validate_existing_addresses, daemon=True).start()
+    
     def validate_existing_addresses(self):
-        """Validate existing address files on startup - checks player first, then mob"""
+        """Validate existing address files on startup - checks player first, then mob (worker thread)"""
         import os
         import pathlib
         
@@ -220,23 +254,47 @@ class BotUI:
         player_file = os.path.join(script_dir, 'cindys_baby_daddy.txt')
         mob_file = os.path.join(script_dir, 'cindys_ex_bf.txt')
         
+        # Game already running on a known build? Then the address DB has everything
+        try:
+            pid = self.select_endless_pid_silent()
+        except Exception:
+            pid = None
+        if pid and self.restore_known_addresses(pid):
+            self.log_message("Known client build - addresses loaded, no scan needed!", 'success')
+            return
+        
         # Check if files exist
         player_exists = os.path.exists(player_file)
         mob_exists = os.path.exists(mob_file)
         
         if not player_exists and not mob_exists:
             self.log_message("No existing addresses found. Please scan for addresses!", 'warning')
-            self.check_address_files()
+            self.root.after(0, self.check_address_files)
             return
         
         # Pick a random validation message
         validation_msg = random.choice(self.validation_scanning_messages)
         self.log_message(f"=== {validation_msg} ===", 'info')
         
+        # With the game running, saved pointer chains re-derive addresses that moved
+        source = None
+        try:
+            pid = self.select_endless_pid_silent()
+            if pid:
+                source = cindy_processes.open_shared(pid)
+        except Exception as e:
+            if bot_module.DEBUG:
+                self.log_message(f"Debug: Could not attach for pointer chains: {e}", 'warning')
+        rederived = False
+        
         # Validate player address first
         if player_exists:
             self.log_message("Checking player address (cindys_baby_daddy.txt)...", 'info')
-            if not self.validate_address_file(player_file, 'player'):
+            player_addr = self.rederive_address(source, player_file, cindy_scanner.PLAYER_PATTERN)
+            if player_addr is not None:
+                rederived = True
+                self.log_message(f"Player address re-derived from pointer chain: 0x{player_addr:08X} ✓", 'success')
+            elif not self.validate_address_file(player_file, 'player'):
                 invalid_msg = random.choice(self.validation_invalid_messages)
                 self.log_message(f"Player address invalid! {invalid_msg}", 'error')
                 os.remove(player_file)
@@ -247,7 +305,11 @@ class BotUI:
         # Validate mob address
         if mob_exists:
             self.log_message("Checking mob address (cindys_ex_bf.txt)...", 'info')
-            if not self.validate_address_file(mob_file, 'mob'):
+            mob_addr = self.rederive_address(source, mob_file, cindy_scanner.MOB_PATTERN)
+            if mob_addr is not None:
+                rederived = True
+                self.log_message(f"Mob address re-derived from pointer chain: 0x{mob_addr:08X} ✓", 'success')
+            elif not self.validate_address_file(mob_file, 'mob'):
                 invalid_msg = random.choice(self.validation_invalid_messages)
                 self.log_message(f"Mob address invalid! {invalid_msg}", 'error')
                 os.remove(mob_file)
@@ -255,8 +317,13 @@ class BotUI:
             else:
                 self.log_message("Mob address still valid! ✓", 'success')
         
+        if source is not None:
+            source.close()
+        if rederived:
+            bot_module.load_addresses()
+        
         # Update UI status
-        self.check_address_files()
+        self.root.after(0, self.check_address_files)
         
         # Check if both are missing now
         player_exists_after = os.path.exists(player_file)
@@ -266,6 +333,75 @@ class BotUI:
             self.log_message("⚠️ WARNING: Server reset detected or addresses expired!", 'warning')
             self.log_message("Please scan for BOTH player and mob addresses again!", 'warning')
     
+    def rederive_address(self, source, filepath, pattern):
+        """Follow saved pointer chains to the live address and rewrite filepath - returns the address or None"""
+        if source is None:
+            return None
+        try:
+            addr = cindy_pointers.follow_saved_chains(source, filepath, pattern)
+        except Exception as e:
+            if bot_module.DEBUG:
+                self.log_message(f"Debug: Pointer chain error: {e}", 'warning')
+            return None
+        if addr is None:
+            return None
+        
+        with open(filepath, 'w') as f:
+            f.write(f"0x{addr:08X}")
+        return addr
+    
+    def save_pointer_chains(self, source, filepath, address):
+        """Pointer scan for a freshly found address so the next start can skip the rescan"""
+        if not cindy_pointers.NUMPY_AVAILABLE:
+            return []
+        self.log_message("Looking for pointer chains so this address survives restarts...", 'info')
+        try:
+            chains = cindy_pointers.find_pointer_chains(source, address)
+        except Exception as e:
+            self.log_message(f"Pointer scan failed: {e}", 'warning')
+            return []
+        if chains:
+            cindy_pointers.save_chains(cindy_pointers.chain_file(filepath), address, chains)
+            self.log_message(f"Saved {len(chains)} pointer chain(s) for 0x{address:08X}", 'success')
+        else:
+            self.log_message("No static pointer chain found - rescan after restarts", 'warning')
+        return chains
+    
+    def remember_address(self, pid, kind, start_addr, end_addr, address, chains):
+        """Store a scan result in the address DB under the running client's build"""
+        try:
+            build, exe_name = cindy_addressdb.build_fingerprint(pid)
+            self.address_db.store(build, kind, start_addr, end_addr, address, chains, exe_name)
+        except Exception as e:
+            self.log_message(f"Could not save to the address DB: {e}", 'warning')
+    
+    def restore_known_addresses(self, pid):
+        """Load the running build's known-good addresses from the address DB - True if both were found
+
+        Hashes the client's exe, so it runs on a worker thread like the scans.
+        """
+        import os
+        import pathlib
+        
+        try:
+            build, exe_name = cindy_addressdb.build_fingerprint(pid)
+            with cindy_processes.open_shared(pid) as source:
+                found = cindy_addressdb.restore(source, self.address_db, build)
+        except Exception as e:
+            if bot_module.DEBUG:
+                self.log_message(f"Debug: Address DB lookup failed: {e}", 'warning')
+            return False
+        
+        script_dir = pathlib.Path(__file__).parent.absolute()
+        for kind, addr in found.items():
+            with open(os.path.join(script_dir, cindy_addressdb.KIND_FILES[kind]), 'w') as f:
+                f.write(f"0x{addr:08X}")
+            self.log_message(f"{kind.title()} address loaded from the address DB: 0x{addr:08X} ✓", 'success')
+        if found:
+            bot_module.ADDRESS_BOOK.notify()
+            self.root.after(0, self.check_address_files)
+        return len(found) == len(cindy_addressdb.KIND_PATTERNS)
+    
     def validate_address_file(self, filepath, addr_type):
         """Validate if an address file contains a valid address"""
         try:
@@ -670,6 +806,44 @@ class BotUI:
         )
         self.control_button.pack(pady=15, padx=20, fill=tk.X)
         
+        # Bot stats - tick latency percentiles, refreshed every second while the bot runs
+        stats_frame = tk.LabelFrame(
+            left_panel,
+            text="Bot Stats",
+            font=('Arial', 11, 'bold'),
+            bg='#1e1e1e',
+            fg='#00aaff',
+            relief=tk.GROOVE,
+            borderwidth=2
+        )
+        stats_frame.pack(pady=(0, 10), padx=15, fill=tk.X)
+        
+        self.stats_labels = {}
+        for key, title in (('runtime', 'Runtime:'), ('ticks', 'Ticks:'), ('read', 'Read:'),
+                           ('process', 'Process:'), ('lag', 'Lag:')):
+            stats_row = tk.Frame(stats_frame, bg='#1e1e1e')
+            stats_row.pack(fill=tk.X, padx=10)
+            
+            tk.Label(
+                stats_row,
+                text=title,
+                font=('Arial', 8),
+                bg='#1e1e1e',
+                fg='#aaaaaa',
+                width=8,
+                anchor='w'
+            ).pack(side=tk.LEFT)
+            
+            self.stats_labels[key] = tk.Label(
+                stats_row,
+                text="-",
+                font=('Consolas', 8),
+                bg='#1e1e1e',
+                fg='#00ff00',
+                anchor='w'
+            )
+            self.stats_labels[key].pack(side=tk.LEFT, fill=tk.X)
+        
         # Clear logs button
         clear_button = tk.Button(
             left_panel,
@@ -862,12 +1036,11 @@ class BotUI:
     def attach_to_process(self):
         """Attach to endless.exe process"""
         try:
-            # Find all endless.exe processes
+            # Find all endless.exe processes (cached by the process watcher)
             endless_pids = []
-            for proc in psutil.process_iter():
+            for pid in self.process_watcher.find():
                 try:
-                    if proc.name().lower() == 'endless.exe':
-                        endless_pids.append((proc.pid, proc))
+                    endless_pids.append((pid, psutil.Process(pid)))
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
             
@@ -886,8 +1059,9 @@ class BotUI:
             
             # Try to attach
             try:
-                pm = pymem.Pymem(pid)
-                pm.close_process()  # Close immediately, just testing
+                # Opens the shared handle - it stays in the pool for the scans and the bot
+                source = cindy_processes.open_shared(pid)
+                source.close()
                 
                 self.process_attached = True
                 self.attached_pid = pid
@@ -895,6 +1069,9 @@ class BotUI:
                 self.attach_btn.config(text="Detach", bg='#cc0000', command=self.detach_from_process)
                 self.log_message(f"Successfully attached to endless.exe (PID: {pid})", 'success')
                 
+                # Known build? Its addresses load straight from the address DB, no scan needed
+                threading.Thread(target=self.restore_after_attach, args=(pid,), daemon=True).start()
+                
             except Exception as e:
                 self.log_message(f"ERROR: Failed to attach to process: {e}", 'error')
                 messagebox.showerror("Attachment Failed", f"Could not attach to endless.exe:\n\n{e}")
@@ -902,6 +1079,11 @@ class BotUI:
         except Exception as e:
             self.log_message(f"ERROR: {e}", 'error')
     
+    def restore_after_attach(self, pid):
+        """Address DB lookup for the client just attached to (worker thread)"""
+        if self.restore_known_addresses(pid):
+            self.log_message("Known client build - no scan needed!", 'success')
+    
     def select_process_dialog(self, endless_pids):
         """Show dialog to select which endless.exe process to attach to"""
         # Create custom dialog
@@ -1110,6 +1292,8 @@ class BotUI:
         self.scan_mob_btn.config(state='disabled')
         self.delay_spinbox.config(state='disabled')
         
+        # Shared pool reference - closed in finally, every way out of the scan
+        source = None
         try:
             # Find process
             pid = self.select_endless_pid_silent()
@@ -1117,9 +1301,12 @@ class BotUI:
                 self.log_message("ERROR: No endless.exe process found. Please start the game first.", 'error')
                 return
             
-            pm = pymem.Pymem(pid)
+            source = cindy_processes.open_shared(pid)
             self.log_message(f"Attached to process PID {pid}", 'info')
             
+            # New scan session - enumerate the readable regions once, every round reuses the map
+            cindy_memory.region_map(source, refresh=True)
+            
             # Get memory range from UI
             try:
                 START_ADDR = int(self.mob_start_var.get(), 16)
@@ -1129,41 +1316,21 @@ class BotUI:
                 messagebox.showerror("Invalid Range", "Memory range must be in hex format (e.g., 0x0019A000)")
                 return
             
-            MIN_SCANS = 4
-            MIN_DIFFERENT_VALUES = 4
-            
-            # Don't log technical details
-            address_scans = defaultdict(list)
-            
-            scan_count = 0
-            valid_addresses = []
-            
             # Get the scan delay from UI
             scan_delay = self.scan_delay_var.get()
             
-            while scan_count < 20 and (scan_count < MIN_SCANS or not valid_addresses):
-                scan_count += 1
-                # Animation handles the status display - no text update here
-                
-                # Perform scan (silently)
-                scan_results = self.scan_mob_memory(pm, START_ADDR, END_ADDR, scan_count)
-                
-                if scan_results:
-                    for addr, pattern, dynamic_values in scan_results:
-                        address_scans[addr].append((scan_count, pattern, dynamic_values))
-                    
-                    if scan_count >= MIN_SCANS:
-                        valid_addresses = []
-                        for addr, scans in address_scans.items():
-                            if len(scans) >= MIN_SCANS:
-                                if self.check_mob_pattern_changes(scans, MIN_DIFFERENT_VALUES):
-                                    valid_addresses.append(addr)
-                        
-                        if valid_addresses:
-                            break
-                
-                if scan_count < 20 and (scan_count < MIN_SCANS or not valid_addresses):
-                    time.sleep(scan_delay)
+            # Don't log technical details (unless debugging)
+            debug_log = None
+            if bot_module.DEBUG:
+                debug_log = lambda message: self.log_message(f"Debug: {message}", 'info')
+            
+            valid_addresses, address_scans = cindy_scanner.find_mob_address(
+                cindy_scanner.live_rounds(source, scan_delay),
+                START_ADDR,
+                END_ADDR,
+                full_scan=self.scan_mob_memory,
+                log=debug_log
+            )
             
             if valid_addresses:
                 # Write to file
@@ -1174,10 +1341,19 @@ class BotUI:
                 
                 with open(filename, "w") as f:
                     f.write(f"0x{valid_addresses[0]:08X}")
+                # A running bot switches to the new address between ticks
+                bot_module.ADDRESS_BOOK.notify()
                 
                 # Pick a random success message with address
                 success_msg = random.choice(SUCCESS_MESSAGES)
                 self.log_message(f"{success_msg} (0x{valid_addresses[0]:08X})", 'success')
+                chains = self.save_pointer_chains(source, filename, valid_addresses[0])
+                self.remember_address(pid, 'mob', START_ADDR, END_ADDR, valid_addresses[0], chains)
+                
+                # Other mob-shaped records around it are the rest of the mob table
+                layout = cindy_mobs.infer_layout(address_scans.keys(), valid_addresses[0])
+                if layout:
+                    self.log_message(f"Mob table: {layout[2]} records, stride 0x{layout[1]:X} from 0x{layout[0]:08X}", 'info')
                 self.mob_addr_status.config(text="[OK] Found", fg='#00ff00')
                 messagebox.showinfo("Success", f"Mob address found and saved!\n\n0x{valid_addresses[0]:08X}")
             else:
@@ -1186,12 +1362,12 @@ class BotUI:
                 self.log_message(f"{failure_msg}", 'error')
                 messagebox.showwarning("Scan Failed", "Could not find a valid mob address.\n\nMake sure you're in-game and mobs are moving around.")
             
-            pm.close_process()
-            
         except Exception as e:
             self.log_message(f"ERROR during mob scan: {e}", 'error')
             messagebox.showerror("Scan Error", f"An error occurred:\n{e}")
         finally:
+            if source is not None:
+                source.close()
             self.scan_mob_btn.config(state='normal')
             self.delay_spinbox.config(state='readonly')
     
@@ -1205,6 +1381,8 @@ class BotUI:
         self.scan_player_btn.config(state='disabled')
         self.delay_spinbox.config(state='disabled')
         
+        # Shared pool reference - closed in finally, every way out of the scan
+        source = None
         try:
             # Find process
             pid = self.select_endless_pid_silent()
@@ -1212,9 +1390,12 @@ class BotUI:
                 self.log_message("ERROR: No endless.exe process found. Please start the game first.", 'error')
                 return
             
-            pm = pymem.Pymem(pid)
+            source = cindy_processes.open_shared(pid)
             self.log_message(f"Attached to process PID {pid}", 'info')
             
+            # New scan session - enumerate the readable regions once, every round reuses the map
+            cindy_memory.region_map(source, refresh=True)
+            
             # Get memory range from UI
             try:
                 START_ADDR = int(self.player_start_var.get(), 16)
@@ -1225,7 +1406,6 @@ class BotUI:
                 return
             
             NUM_SCANS = 2
-            CHUNK_SIZE = 1024 * 1024
             
             self.log_message(f"Scanning memory range 0x{START_ADDR:08X} to 0x{END_ADDR:08X}", 'info')
             self.log_message(f"This may take a moment...", 'info')
@@ -1235,15 +1415,31 @@ class BotUI:
             # Get the scan delay from UI
             scan_delay = self.scan_delay_var.get()
             
+            # Survivors of the last scan - later scans only re-read these
+            candidates = None
+            
             for scan_num in range(1, NUM_SCANS + 1):
                 # Animation handles the status display - no text update here
                 
-                scan_results = self.scan_player_memory(pm, START_ADDR, END_ADDR, CHUNK_SIZE, scan_num)
+                if candidates is None:
+                    scan_results = self.scan_player_memory(source, START_ADDR, END_ADDR, scan_num)
+                else:
+                    scan_results = cindy_scanner.rescan_candidates(source, candidates, cindy_scanner.PLAYER_PATTERN)
                 
                 if scan_results:
                     for addr, pattern, static_values in scan_results:
                         address_scans[addr].append((scan_num, pattern, static_values))
                 
+                # Player values must stay put - drop anything that changed since the first scan
+                candidates = [
+                    addr for addr, _, static_values in scan_results
+                    if address_scans[addr][0][2] == static_values
+                ]
+                if bot_module.DEBUG:
+                    self.log_message(f"Debug: Player scan {scan_num}: {len(candidates)} candidates left", 'info')
+                if not candidates:
+                    break
+                
                 if scan_num < NUM_SCANS:
                     time.sleep(scan_delay)
             
@@ -1266,10 +1462,14 @@ class BotUI:
                 
                 with open(filename, "w") as f:
                     f.write(f"0x{consistent_addresses[0]:08X}\n")
+                # A running bot switches to the new address between ticks
+                bot_module.ADDRESS_BOOK.notify()
                 
                 # Pick a random success message with address
                 success_msg = random.choice(SUCCESS_MESSAGES)
                 self.log_message(f"{success_msg} (0x{consistent_addresses[0]:08X})", 'success')
+                chains = self.save_pointer_chains(source, filename, consistent_addresses[0])
+                self.remember_address(pid, 'player', START_ADDR, END_ADDR, consistent_addresses[0], chains)
                 self.player_addr_status.config(text="[OK] Found", fg='#00ff00')
                 messagebox.showinfo("Success", f"Player address found and saved!\n\n0x{consistent_addresses[0]:08X}")
             else:
@@ -1278,192 +1478,27 @@ class BotUI:
                 self.log_message(f"{failure_msg}", 'error')
                 messagebox.showwarning("Scan Failed", "Could not find a valid player address.\n\nMake sure you're in-game.")
             
-            pm.close_process()
-            
         except Exception as e:
             self.log_message(f"ERROR during player scan: {e}", 'error')
             messagebox.showerror("Scan Error", f"An error occurred:\n{e}")
         finally:
+            if source is not None:
+                source.close()
             self.scan_player_btn.config(state='normal')
             self.delay_spinbox.config(state='readonly')
     
-    def scan_mob_memory(self, pm, start_addr, end_addr, scan_number):
-        """Scan memory for mob pattern in chunks with aggressive reading (silently)"""
-        CHUNK_SIZE = 4096  # 4KB chunks
-        matches = []
-        current_addr = start_addr
-        
-        while current_addr < end_addr:
-            size = min(CHUNK_SIZE, end_addr - current_addr)
-            buffer = None
-            
-            # Try multiple methods to read memory
-            try:
-                # Method 1: Normal read
-                buffer = pm.read_bytes(current_addr, size)
-            except Exception:
-                try:
-                    # Method 2: Try reading with process handle directly
-                    import ctypes
-                    kernel32 = ctypes.windll.kernel32
-                    buffer_array = (ctypes.c_char * size)()
-                    bytes_read = ctypes.c_size_t()
-                    
-                    success = kernel32.ReadProcessMemory(
-                        pm.process_handle,
-                        ctypes.c_void_p(current_addr),
-                        ctypes.byref(buffer_array),
-                        size,
-                        ctypes.byref(bytes_read)
-                    )
-                    
-                    if success and bytes_read.value > 0:
-                        buffer = bytes(buffer_array[:bytes_read.value])
-                except Exception:
-                    # Method 3: Try reading smaller chunks
-                    try:
-                        small_size = 1024  # Try 1KB instead
-                        buffer = pm.read_bytes(current_addr, small_size)
-                        size = small_size
-                    except Exception:
-                        pass
-            
-            # If we got any data, scan it
-            if buffer:
-                for offset in range(0, len(buffer) - 32):
-                    if self.is_mob_pattern_match(buffer, offset):
-                        addr = current_addr + offset
-                        dynamic_values = self.extract_mob_dynamic_values(buffer, offset)
-                        matches.append((addr, None, dynamic_values))
-            
-            current_addr += size
-        
-        return matches
-    
-    def is_mob_pattern_match(self, buffer, offset):
-        """Check if bytes match mob pattern"""
-        try:
-            # Pattern: [00-03] 00 00 00 [01-FF] 00 00 00 [01-FF] 00 00 00 [00-03] 00 00 00 [00-03] 00 00 00 ...
-            if not (0 <= buffer[offset] <= 3):
-                return False
-            if buffer[offset+1] != 0 or buffer[offset+2] != 0 or buffer[offset+3] != 0:
-                return False
-            if not (1 <= buffer[offset+4] <= 255):
-                return False
-            if buffer[offset+5] != 0 or buffer[offset+6] != 0 or buffer[offset+7] != 0:
-                return False
-            if not (1 <= buffer[offset+8] <= 255):
-                return False
-            if buffer[offset+9] != 0 or buffer[offset+10] != 0 or buffer[offset+11] != 0:
-                return False
-            if not (0 <= buffer[offset+12] <= 3):
-                return False
-            if buffer[offset+13] != 0 or buffer[offset+14] != 0 or buffer[offset+15] != 0:
-                return False
-            if not (0 <= buffer[offset+16] <= 3) or buffer[offset+16] != buffer[offset+12]:
-                return False
-            if buffer[offset+17] != 0 or buffer[offset+18] != 0 or buffer[offset+19] != 0:
-                return False
-            for i in range(20, 32):
-                if buffer[offset+i] != 0:
-                    return False
-            return True
-        except IndexError:
-            return False
-    
-    def extract_mob_dynamic_values(self, buffer, offset):
-        """Extract dynamic values from mob pattern"""
-        return {
-            'first_byte': buffer[offset],
-            'fifth_byte': buffer[offset+4],
-            'ninth_byte': buffer[offset+8],
-            'control_bytes': buffer[offset+12]
-        }
-    
-    def check_mob_pattern_changes(self, address_scans, min_different):
-        """Check if mob pattern has enough variation (silent)"""
-        first_bytes = [v['first_byte'] for _, _, v in address_scans]
-        fifth_bytes = [v['fifth_byte'] for _, _, v in address_scans]
-        ninth_bytes = [v['ninth_byte'] for _, _, v in address_scans]
-        
-        unique_first = set(first_bytes)
-        unique_fifth = set(fifth_bytes)
-        unique_ninth = set(ninth_bytes)
-        
-        total_different = len(unique_first) + len(unique_fifth) + len(unique_ninth)
-        
-        # Check for position variation silently
-        has_position_variation = len(unique_fifth) >= 2 or len(unique_ninth) >= 2
-        
-        if has_position_variation:
-            return True
-        elif total_different >= min_different:
-            return True
-        else:
-            return False
-    
-    def scan_player_memory(self, pm, start_addr, end_addr, chunk_size, scan_number):
-        """Scan memory for player pattern in chunks (silent)"""
-        matches = []
-        current_addr = start_addr
-        
-        while current_addr < end_addr:
-            size = min(chunk_size, end_addr - current_addr)
-            
-            try:
-                buffer = pm.read_bytes(current_addr, size)
-                
-                for offset in range(0, len(buffer) - 32):
-                    if self.is_player_pattern_match(buffer, offset):
-                        addr = current_addr + offset
-                        static_values = self.extract_player_static_values(buffer, offset)
-                        matches.append((addr, None, static_values))
-                
-            except Exception:
-                pass
-            
-            current_addr += size
-        
-        return matches
-    
-    def is_player_pattern_match(self, buffer, offset):
-        """Check if bytes match player pattern"""
-        try:
-            # Pattern: (4-180) 00 00 00 (4-180) 00 00 00 ?? ?? 00 00 ?? ?? 00 00 ... FF FF
-            if not (4 <= buffer[offset] <= 180):
-                return False
-            if buffer[offset+1] != 0 or buffer[offset+2] != 0 or buffer[offset+3] != 0:
-                return False
-            if not (4 <= buffer[offset+4] <= 180):
-                return False
-            if buffer[offset+5] != 0 or buffer[offset+6] != 0 or buffer[offset+7] != 0:
-                return False
-            if buffer[offset+10] != 0 or buffer[offset+11] != 0:
-                return False
-            if buffer[offset+14] != 0 or buffer[offset+15] != 0:
-                return False
-            for i in range(16, 24):
-                if buffer[offset+i] != 0:
-                    return False
-            if buffer[offset+30] != 0xFF or buffer[offset+31] != 0xFF:
-                return False
-            return True
-        except IndexError:
-            return False
+    def scan_mob_memory(self, source, start_addr, end_addr, scan_number):
+        """Scan memory for mob pattern, one read per readable region (silently)"""
+        return cindy_scanner.scan_mob_range(source, start_addr, end_addr, scan_number)
     
-    def extract_player_static_values(self, buffer, offset):
-        """Extract static values from player pattern"""
-        return {
-            'first_byte': buffer[offset],
-            'fifth_byte': buffer[offset+4]
-        }
+    def scan_player_memory(self, source, start_addr, end_addr, scan_number):
+        """Scan memory for player pattern, one read per readable region (silent)"""
+        # Sharded across worker processes, keeps this thread (and the GIL) free for the UI
+        return self.parallel_scanner.scan(source, start_addr, end_addr, 'player')
     
     def select_endless_pid_silent(self):
         """Find endless.exe process without prompts"""
-        for proc in psutil.process_iter():
-            if proc.name().lower() == 'endless.exe':
-                return proc.pid
-        return None
+        return self.process_watcher.first()
     
     def check_address_files(self):
         """Check if address files exist and update UI accordingly"""
@@ -1572,7 +1607,14 @@ class BotUI:
         old_stdout = sys.stdout
         sys.stdout = StdoutRedirector(self.log_queue, self.stats)
         
+        # Torn down in finally, however the loop ends
+        source = session = tracker_events = client_exits = scheduler = None
+        
         try:
+            # Addresses come from the address files and follow rescans while the bot runs
+            address_book = bot_module.ADDRESS_BOOK
+            address_book.refresh()
+            
             # Verify addresses are available
             if bot_module.CHAR_X_ADDR is None or bot_module.CHAR_Y_ADDR is None:
                 print("ERROR: Missing player addresses.")
@@ -1592,45 +1634,86 @@ class BotUI:
                 return
 
             # Attach to process
-            pm = pymem.Pymem(pid)
+            source = cindy_processes.open_shared(pid)
             print(f"Attached to process PID {pid}")
             print("Bot is now running. Use the STOP BOT button to stop.")
             
-            # Initialize tracking
-            tracked_mobs = {}
-            spawn_locations = {}
-            next_mob_id = 1
+            # The whole mob table in one read (numpy), otherwise just the mob fields cindycore knows
+            mob_table = None
+            if cindy_mobs.NUMPY_AVAILABLE:
+                mob_table = cindy_mobs.discover_table(source, address_book.mob_base)
+                print(f"Tracking {mob_table.count} mob record(s), stride 0x{mob_table.stride:X}")
+            
+            # Every other field in as few reads as possible (player struct [+ mob window] = 2 reads per tick),
+            # change events go to whoever subscribed to self.event_bus
+            session = cindy_sessions.ClientSession(pid, source, address_book, mob_table, self.event_bus)
+            if bot_module.DEBUG:
+                print(f"Debug: {len(session.read_plan) + (mob_table is not None)} reads per tick")
+            
+            # Optionally log every tick's reads so the run can be replayed offline (cindy_replay.py)
+            recorder = None
+            if cindy_config.RECORD_POLL_LOG:
+                import os
+                import pathlib
+                script_dir = pathlib.Path(__file__).parent.absolute()
+                meta = cindy_replay.recording_meta(session.read_plan, mob_table)
+                recorder = cindy_replay.RecordingSource(source, os.path.join(script_dir, cindy_config.POLL_LOG_FILE), meta)
+                session.source = recorder
+                print(f"Recording reads to {cindy_config.POLL_LOG_FILE}")
+            
+            # Mobs by spawn point, kept up to date from the events (kept on self for other features)
+            tracker = cindy_tracker.MobTracker()
+            tracker_events = self.event_bus.subscribe(kinds=cindy_tracker.MOB_EVENTS)
+            self.mob_tracker = tracker
+            
+            # The client exiting stops the bot right away instead of after a string of read errors
+            client_exits = self.process_watcher.bus.subscribe(kinds=(cindy_processes.ProcessExited,))
+            
+            # Polls fast while things move, backs off while idle (kept on self for the stats panel)
+            scheduler = cindy_scheduler.PollScheduler()
+            self.poll_scheduler = scheduler
             
             # Main bot loop
             while self.bot_running:
+                # A rescan rewrote an address file - switch over before this tick's reads
                 try:
-                    # Read character position
-                    char_x = pm.read_int(bot_module.CHAR_X_ADDR)
-                    char_y = pm.read_int(bot_module.CHAR_Y_ADDR)
-                    
-                    # Read mob movement data
-                    face_val = pm.read_int(bot_module.FACE_ADDR)
-                    y_val = pm.read_int(bot_module.Y_ADDR)
-                    x_val = pm.read_int(bot_module.X_ADDR)
-                    
-                    # Read spawn data
-                    spawn_face_val = pm.read_int(bot_module.SPAWN_FACE_ADDR)
-                    spawn_y_val = pm.read_int(bot_module.SPAWN_Y_ADDR)
-                    spawn_x_val = pm.read_int(bot_module.SPAWN_X_ADDR)
-                    
-                    # Process mob movements and spawns here
-                    # (simplified for now - can be expanded later)
-                    
-                    # Small delay to prevent CPU overuse
-                    time.sleep(0.01)
-                    
+                    if session.refresh_addresses():
+                        print(f"Addresses reloaded: {address_book}")
+                        if recorder is not None:
+                            # Table discovery went through the recorder, that's not a tick
+                            recorder.discard_tick()
+                            # New read plan - later ticks go to a new log that replays with it
+                            recorder.set_meta(cindy_replay.recording_meta(session.read_plan, session.mob_table))
                 except Exception as e:
-                    print(f"Memory read error: {e}")
-                    time.sleep(0.5)
-                    continue
+                    print(f"Warning: Could not reload addresses: {e}")
+                
+                scheduler.start_tick()
+                
+                # Read the tick's sample and publish what changed (player moved, mob moved/faced, ...)
+                result = session.poll()
+                scheduler.read_done()
+                if recorder is not None:
+                    if result.error is None:
+                        recorder.end_tick()
+                    else:
+                        recorder.discard_tick()
+                if result.error is None:
+                    tracker.handle(tracker_events.drain())
+                    
+                    # Any event this tick speeds polling up
+                    delay = scheduler.tick_done(session.poller.version)
+                else:
+                    print(f"Memory read error: {result.error}")
+                    delay = scheduler.tick_failed()
+                
+                if len(client_exits) and any(event.pid == pid for event in client_exits.drain()):
+                    print(f"ERROR: endless.exe (PID {pid}) exited. Stopping bot.")
+                    break
+                
+                time.sleep(delay)
             
-            # Close process handle
-            pm.close_process()
+            if recorder is not None:
+                print(f"Recorded {recorder.recorded} ticks to {', '.join(recorder.paths) or 'nothing'}")
             print("Bot stopped successfully.")
             
         except Exception as e:
@@ -1639,6 +1722,23 @@ class BotUI:
             traceback.print_exc()
         
         finally:
+            # Unsubscribe (nobody would drain these queues any more) and give back the process handle
+            if client_exits is not None:
+                self.process_watcher.bus.unsubscribe(client_exits)
+            if tracker_events is not None:
+                self.event_bus.unsubscribe(tracker_events)
+            try:
+                if session is not None:
+                    session.close()
+                elif source is not None:
+                    source.close()
+            except Exception as e:
+                print(f"Warning: Could not close process handle: {e}")
+            
+            # A crashed run's latencies are the interesting ones
+            if scheduler is not None:
+                self.export_tick_stats()
+            
             # Ensure original stdout is restored
             sys.stdout = old_stdout
             
@@ -1661,9 +1761,48 @@ class BotUI:
         else:
             self.stats_labels['runtime'].config(text="0.0 s")
         
+        # Tick latency percentiles from the bot loop's scheduler
+        scheduler = self.poll_scheduler
+        if scheduler is not None:
+            tick_stats = scheduler.stats
+            self.stats_labels['ticks'].config(
+                text=f"{tick_stats.ticks} ({tick_stats.errors} errors)",
+                fg='#ffaa00' if tick_stats.errors else '#00ff00'
+            )
+            for metric in tick_stats.METRICS:
+                self.stats_labels[metric].config(text=tick_stats.format_line(metric))
+        
         # Repeat every second
         self.root.after(1000, self.update_stats)
     
+    def export_tick_stats(self):
+        """Write the bot loop's latency histograms next to the address files"""
+        if self.poll_scheduler is None:
+            return
+        import os
+        import pathlib
+        
+        script_dir = pathlib.Path(__file__).parent.absolute()
+        path = os.path.join(script_dir, cindy_config.TICK_STATS_FILE)
+        try:
+            self.poll_scheduler.stats.export(path)
+            print(f"Tick stats saved to {cindy_config.TICK_STATS_FILE}")
+        except Exception as e:
+            print(f"Warning: Could not save tick stats: {e}")
+    
+    def check_process_events(self):
+        """Notice the attached client exiting (process watcher events, main thread)"""
+        for event in self.process_events.drain():
+            if self.process_attached and event.pid == self.attached_pid:
+                self.log_message(f"endless.exe (PID: {event.pid}) exited!", 'error')
+                self.process_attached = False
+                self.attached_pid = None
+                self.attach_status_label.config(text="Not Attached", fg='#ff0000')
+                self.attach_btn.config(text="Attach to endless.exe", bg='#ff6600', command=self.attach_to_process)
+        
+        if hasattr(self.root, 'winfo_exists') and self.root.winfo_exists():
+            self.root.after(100, self.check_process_events)
+    
     def update_log(self):
         """Update console from log queue (thread-safe)"""
         try:
@@ -7,6 +7,9 @@ import os
 import pathlib
 import random
 
+import cindy_config
+import cindy_processes
+
 # Debug mode flag
 DEBUG = False
 
@@ -62,40 +65,176 @@ def read_address_from_file(filename):
         print(f"Error reading from {filename}: {e}")
         return None
 
-# Read addresses
-MOB_BASE_ADDR = read_address_from_file('cindys_ex_bf.txt')
-CHAR_X_ADDR = read_address_from_file('cindys_baby_daddy.txt')
-
-# Calculate offsets
-if MOB_BASE_ADDR is not None:
-    # Movement addresses
-    FACE_ADDR = MOB_BASE_ADDR
-    Y_ADDR = MOB_BASE_ADDR + 0x4
-    X_ADDR = MOB_BASE_ADDR + 0x8
-    
-    # Spawn addresses - CORRECTED using 0x0019B4EC as the face reference
-    SPAWN_FACE_ADDR = MOB_BASE_ADDR - 0x14  
-    SPAWN_Y_ADDR = MOB_BASE_ADDR - 0x10     
-    SPAWN_X_ADDR = MOB_BASE_ADDR - 0xC      
-    
-    # Mob ID addresses (for hit detection)
-    MOB_ID_ADDR1 = MOB_BASE_ADDR + 0x98
-    MOB_ID_ADDR2 = MOB_BASE_ADDR + 0xA0
-    
-    # Kill detection addresses
-    KILL_ADDR1 = MOB_BASE_ADDR + 0x9C
-    KILL_ADDR2 = MOB_BASE_ADDR + 0xA4
-else:
-    print("Error: Failed to read mob address")
-    FACE_ADDR = Y_ADDR = X_ADDR = None
-    SPAWN_FACE_ADDR = SPAWN_Y_ADDR = SPAWN_X_ADDR = None
-    MOB_ID_ADDR1 = MOB_ID_ADDR2 = None
-
-if CHAR_X_ADDR is not None:
-    CHAR_Y_ADDR = CHAR_X_ADDR + 0x4
-else:
-    print("Error: Failed to read player address")
-    CHAR_Y_ADDR = None
+# Field offsets from the two scanned addresses
+PLAYER_FIELD_OFFSETS = {'char_x': 0x0, 'char_y': 0x4}
+MOB_FIELD_OFFSETS = {
+    # Movement
+    'face': 0x0,
+    'y': 0x4,
+    'x': 0x8,
+    # Spawn - CORRECTED using 0x0019B4EC as the face reference
+    'spawn_face': -0x14,
+    'spawn_y': -0x10,
+    'spawn_x': -0xC,
+    # Mob ID (for hit detection)
+    'mob_id1': 0x98,
+    'mob_id2': 0xA0,
+    # Kill detection
+    'kill1': 0x9C,
+    'kill2': 0xA4,
+}
+
+class AddressBook:
+    """The scanned addresses of one client - lets several clients run side by side.
+
+    The two base addresses and every field derived from them are kept as one
+    tuple that is replaced as a whole, so a reader never sees half an update
+    and offsets are only added up once per change.
+    """
+
+    def __init__(self, mob_base=None, char_x=None):
+        self._state = self.derive(mob_base, char_x)
+        self.version = 1
+
+    @staticmethod
+    def derive(mob_base, char_x):
+        """(mob_base, char_x, fields) - fields without an address are left out."""
+        fields = {}
+        if char_x is not None:
+            fields.update({name: char_x + offset for name, offset in PLAYER_FIELD_OFFSETS.items()})
+        if mob_base is not None:
+            fields.update({name: mob_base + offset for name, offset in MOB_FIELD_OFFSETS.items()})
+        return (mob_base, char_x, fields)
+
+    def state(self):
+        return self._state
+
+    def set(self, mob_base, char_x):
+        """Swap in new base addresses (no-op if they didn't change)."""
+        if self._state is not None and self._state[:2] == (mob_base, char_x):
+            return
+        self._state = self.derive(mob_base, char_x)
+        self.version += 1
+
+    def refresh(self):
+        """Pick up changed addresses (call between ticks) - True if they changed. Fixed books never do."""
+        return False
+
+    @property
+    def mob_base(self):
+        return self.state()[0]
+
+    @property
+    def char_x(self):
+        return self.state()[1]
+
+    def fields(self):
+        """Every address the bot reads each tick, by field name (fields without an address are left out)."""
+        return dict(self.state()[2])
+
+    def __repr__(self):
+        mob_base, char_x, _ = self.state()
+        mob = f"0x{mob_base:08X}" if mob_base is not None else None
+        char = f"0x{char_x:08X}" if char_x is not None else None
+        return f"{type(self).__name__}(mob_base={mob}, char_x={char})"
+
+class FileAddressBook(AddressBook):
+    """Addresses from the address files - read on first use, reloaded when they change.
+
+    refresh() reloads after notify() (the scanner just wrote a file) or when a
+    file's mtime changed; mtimes are checked at most every check_interval
+    seconds, so calling it every tick costs a clock read.
+    """
+
+    def __init__(self, mob_file=cindy_config.MOB_ADDRESS_FILE,
+                 player_file=cindy_config.PLAYER_ADDRESS_FILE,
+                 check_interval=cindy_config.ADDRESS_CHECK_INTERVAL):
+        script_dir = pathlib.Path(__file__).parent.absolute()
+        self.mob_file = os.path.join(script_dir, mob_file)
+        self.player_file = os.path.join(script_dir, player_file)
+        self.check_interval = check_interval
+
+        self._state = None
+        self.version = 0
+        self.mtimes = None
+        self.dirty = True
+        self.next_check = 0.0
+
+    def state(self):
+        if self._state is None:
+            self.reload()
+        return self._state
+
+    def notify(self):
+        """An address file was just rewritten - reload on the next refresh()."""
+        self.dirty = True
+
+    def file_mtimes(self):
+        mtimes = []
+        for path in (self.mob_file, self.player_file):
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def refresh(self):
+        """Reload if notified or a file changed - True if the addresses changed."""
+        if not self.dirty:
+            now = time.monotonic()
+            if now < self.next_check:
+                return False
+            self.next_check = now + self.check_interval
+            if self.file_mtimes() == self.mtimes:
+                return False
+        old = self._state
+        self.reload()
+        return old is None or old[:2] != self._state[:2]
+
+    def reload(self):
+        """Read both address files now."""
+        self.dirty = False
+        self.mtimes = self.file_mtimes()
+        mob_base = read_address_from_file(self.mob_file)
+        char_x = read_address_from_file(self.player_file)
+        if mob_base is None:
+            print("Error: Failed to read mob address")
+        if char_x is None:
+            print("Error: Failed to read player address")
+        self.set(mob_base, char_x)
+
+# The bot's own client, from the address files
+ADDRESS_BOOK = FileAddressBook()
+
+def load_addresses():
+    """Re-read the address files now."""
+    ADDRESS_BOOK.reload()
+
+def field_addresses():
+    """Every address the bot reads each tick, by field name (fields without an address are left out)."""
+    return ADDRESS_BOOK.fields()
+
+# The old module-level address names, served from ADDRESS_BOOK so they are never stale
+ADDRESS_NAMES = {
+    'MOB_BASE_ADDR': 'face',
+    'CHAR_X_ADDR': 'char_x',
+    'CHAR_Y_ADDR': 'char_y',
+    'FACE_ADDR': 'face',
+    'Y_ADDR': 'y',
+    'X_ADDR': 'x',
+    'SPAWN_FACE_ADDR': 'spawn_face',
+    'SPAWN_Y_ADDR': 'spawn_y',
+    'SPAWN_X_ADDR': 'spawn_x',
+    'MOB_ID_ADDR1': 'mob_id1',
+    'MOB_ID_ADDR2': 'mob_id2',
+    'KILL_ADDR1': 'kill1',
+    'KILL_ADDR2': 'kill2',
+}
+
+def __getattr__(name):
+    if name in ADDRESS_NAMES:
+        return ADDRESS_BOOK.state()[2].get(ADDRESS_NAMES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Direction mapping
 FACE_OFFSETS = {0: (0, 1), 1: (-1, 0), 2: (0, -1), 3: (1, 0)}  # down, left, up, right
@@ -117,12 +256,13 @@ movement_durations = {key: INITIAL_MOVEMENT_DURATION for key in ['up', 'down', '
 ctrl_duration = INITIAL_CTRL_DURATION
 movement_success_rate = {key: {'attempts': 0, 'successes': 0} for key in ['up', 'down', 'left', 'right', 'ctrl']}
 
+def find_endless_pids():
+    """PIDs of every running endless.exe, oldest first (from the shared process watcher)."""
+    return cindy_processes.get_watcher().find()
+
 def select_endless_pid():
     """Find endless.exe process."""
-    endless_pids = []
-    for proc in psutil.process_iter():
-        if proc.name().lower() == 'endless.exe':
-            endless_pids.append(proc.pid)
+    endless_pids = find_endless_pids()
 
     if not endless_pids:
         print("No 'endless.exe' found.")
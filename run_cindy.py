@@ -6,6 +6,7 @@ Quick launcher without splash screen
 """
 
 import tkinter as tk
+import multiprocessing
 import cindy_ui
 
 def main():
@@ -15,4 +16,5 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Scanner worker processes in the .exe build
     main()